@@ -1,4 +1,13 @@
-from flask import Flask, send_from_directory, send_file
+if __name__ == "__main__":
+    # Must run before anything imports socket/threading: the Redis
+    # message_queue listener and redis-py presence calls would otherwise
+    # block the eventlet hub. Only for the server; Celery imports this module.
+    import eventlet
+    eventlet.monkey_patch()
+
+from flask import Flask, Response, abort, send_from_directory
+from werkzeug.security import safe_join
+import mimetypes
 from flask_pymongo import PyMongo
 from flask_cors import CORS
 from flask_restx import Api
@@ -9,9 +18,19 @@ from flask_socketio import SocketIO
 from routes.voice import socketio  # This is your socketio instance
 from flask_jwt_extended import JWTManager
 from routes.profile import profile_bp
+from utils import compression, frontend_assets, mongo_metrics
+from utils.json_provider import MongoJSONProvider
 load_dotenv()
 
-app = Flask(__name__, static_folder='../frontend/dist', static_url_path='/')
+# static_folder disabled: serve_frontend below serves the built SPA
+app = Flask(__name__, static_folder=None)
+
+# -------------------- Compression --------------------
+# gzip/brotli for JSON bodies above COMPRESS_MIN_SIZE bytes
+app.config["COMPRESS_MIN_SIZE"] = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+app.config["COMPRESS_GZIP_LEVEL"] = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+app.config["COMPRESS_BR_QUALITY"] = int(os.getenv("COMPRESS_BR_QUALITY", 4))
+compression.init_app(app)
 
 # -------------------- CORS --------------------
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -23,6 +42,7 @@ app.config["JWT_EXPIRY_HOURS"] = 24
 app.config["JWT_TOKEN_LOCATION"] = ["headers"]
 app.config["JWT_HEADER_NAME"] = "Authorization"
 app.config["JWT_HEADER_TYPE"] = "Bearer"
+app.config["JWT_CACHE_SIZE"] = int(os.getenv("JWT_CACHE_SIZE", 10000))
 jwt = JWTManager(app)
 
 # -------------------- EMAIL --------------------
@@ -33,16 +53,161 @@ app.config["MAIL_PASSWORD"] = os.getenv("MAIL_PASSWORD")
 
 # -------------------- MongoDB --------------------
 app.config["MONGO_URI"] = os.getenv("MONGO_URI")
-mongo = PyMongo(app)
+
+# Pool / timeout tuning (unset → driver defaults)
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", int),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", int),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", int),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", int),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", int),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", int),
+    "compressors": ("MONGO_COMPRESSORS", str),  # e.g. "zstd,snappy,zlib"
+}
+mongo_options = {
+    option: cast(os.environ[env])
+    for option, (env, cast) in MONGO_CLIENT_OPTIONS.items()
+    if os.getenv(env)
+}
+
+mongo = PyMongo(
+    app,
+    event_listeners=[mongo_metrics.QueryMetricsListener()],
+    **mongo_options
+)
+mongo_metrics.init_app(app)
+
+# -------------------- JSON --------------------
+# ObjectId / datetime serialized natively (orjson when installed).
+# After PyMongo(app): flask_pymongo installs its own BSONProvider there.
+app.json = MongoJSONProvider(app)
+
+from utils.indexes import ensure_indexes, check_indexes
+
+if os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true":
+    try:
+        for name, error in ensure_indexes(mongo.db)[1].items():
+            print(f"⚠️ Index {name} not created:", error)
+    except Exception as e:
+        print("⚠️ Index bootstrap failed:", e)
+
+from utils.counters import ensure_counters
+
+try:
+    ensure_counters(mongo.db)
+except Exception as e:
+    print("⚠️ Counter bootstrap failed:", e)
+
+from utils.voice_rooms import seed_default_rooms
+
+try:
+    seed_default_rooms(mongo.db)
+except Exception as e:
+    print("⚠️ Voice room seeding failed:", e)
+
+
+@app.cli.command("ensure-indexes")
+def ensure_indexes_command():
+    """Create all indexes from the manifest (idempotent)."""
+    created, failures = ensure_indexes(mongo.db)
+    for collection, names in created.items():
+        print(f"✅ {collection}: {', '.join(names)}")
+    for name, error in failures.items():
+        print(f"❌ {name}: {error}")
+    if failures:
+        raise SystemExit(1)
+
+
+@app.cli.command("check-indexes")
+def check_indexes_command():
+    """Fail if any hot query still does a COLLSCAN."""
+    failures = check_indexes(mongo.db)
+    for name, stages in failures.items():
+        print(f"❌ {name}: {' -> '.join(stages)}")
+    if failures:
+        raise SystemExit(1)
+    print("✅ All hot queries use an index")
+
+
+@app.cli.command("rebuild-rating-aggregates")
+def rebuild_rating_aggregates_command():
+    """Backfill helper rating_sum / total_reviews / histogram."""
+    from utils.ratings import rebuild_rating_aggregates
+
+    print(f"✅ Rebuilt rating aggregates for {rebuild_rating_aggregates(mongo.db)} helper(s)")
+
+
+@app.cli.command("backfill-account-index")
+def backfill_account_index_command():
+    """Add accounts_by_email entries for existing users and helpers."""
+    from utils.accounts import backfill_account_index
+
+    print(f"✅ Indexed {backfill_account_index(mongo.db)} account email(s)")
+
+
+@app.cli.command("reconcile-counters")
+def reconcile_counters_command():
+    """Rebuild platform counters from source collections and report drift."""
+    from utils.counters import reconcile_counters
+
+    result = reconcile_counters(mongo.db)
+    for field, delta in result["drift"].items():
+        print(f"⚠️ {field}: drift {delta:+d}")
+    print("✅ Counters rebuilt:", result["counters"])
 
 # -------------------- Uploads --------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 app.config["UPLOAD_FOLDER"] = os.path.join(BASE_DIR, "uploads")
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
+# Per-file cap for helper documents; whole-body cap rejects oversize
+# multipart requests before Werkzeug spools them
+app.config["UPLOAD_MAX_BYTES"] = int(os.getenv("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+app.config["MAX_CONTENT_LENGTH"] = 2 * app.config["UPLOAD_MAX_BYTES"] + 1024 * 1024
+
+# Optional proxy offload: "nginx" → X-Accel-Redirect, "sendfile" → X-Sendfile
+app.config["UPLOADS_OFFLOAD"] = os.getenv("UPLOADS_OFFLOAD", "").lower()
+app.config["UPLOADS_ACCEL_PREFIX"] = os.getenv("UPLOADS_ACCEL_PREFIX", "/protected-uploads")
+app.config["USE_X_SENDFILE"] = app.config["UPLOADS_OFFLOAD"] == "sendfile"
+
+UPLOAD_IMMUTABLE_PREFIXES = ("blobs/", "thumbs/")
+
+
 @app.route("/uploads/<path:filename>")
 def uploaded_files(filename):
-    return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
+    path = safe_join(app.config["UPLOAD_FOLDER"], filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    # Content-addressed files never change: hash is a strong ETag
+    immutable = filename.startswith(UPLOAD_IMMUTABLE_PREFIXES)
+    etag = os.path.splitext(os.path.basename(filename))[0] if immutable else True
+
+    if app.config["UPLOADS_OFFLOAD"] == "nginx":
+        # Proxy serves the bytes (and ranges); we only authorize + set headers
+        response = Response(mimetype=mimetypes.guess_type(filename)[0])
+        response.headers["X-Accel-Redirect"] = (
+            f"{app.config['UPLOADS_ACCEL_PREFIX'].rstrip('/')}/{filename}"
+        )
+        stat = os.stat(path)
+        response.set_etag(etag if immutable else f"{stat.st_mtime}-{stat.st_size}")
+    else:
+        # Werkzeug handles If-None-Match / If-Modified-Since and Range
+        response = send_from_directory(
+            app.config["UPLOAD_FOLDER"], filename, etag=etag, conditional=True
+        )
+
+    # ID documents: cacheable by the admin's browser only
+    response.cache_control.private = True
+    if immutable:
+        response.cache_control.no_cache = None
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    response.headers["Accept-Ranges"] = "bytes"
+
+    return response
 
 # -------------------- Swagger --------------------
 api = Api(
@@ -83,13 +248,23 @@ api.add_namespace(ratings_ns, path="/ratings")
 # -------------------- Serve React Frontend --------------------
 FRONTEND_DIST = os.path.join(os.path.dirname(BASE_DIR), "frontend", "dist")
 
+# 🔥 Scanned once at startup (restart after a new frontend build)
+FRONTEND_MANIFEST = frontend_assets.build_manifest(FRONTEND_DIST)
+
+
 @app.route("/", defaults={"path": ""})
 @app.route("/<path:path>")
 def serve_frontend(path):
-    if path != "" and os.path.exists(os.path.join(FRONTEND_DIST, path)):
-        return send_from_directory(FRONTEND_DIST, path)
-    else:
-        return send_file(os.path.join(FRONTEND_DIST, "index.html"))
+    asset = FRONTEND_MANIFEST.get(path) or FRONTEND_MANIFEST.get("index.html")
+    if asset is None:
+        abort(404)
+    return frontend_assets.send_asset(asset)
+
+
+@app.cli.command("precompress-frontend")
+def precompress_frontend_command():
+    """Write .gz/.br variants of the built frontend assets."""
+    print(f"✅ Wrote {frontend_assets.precompress(FRONTEND_DIST)} precompressed file(s)")
 
 # -------------------- Root (for API check) --------------------
 @app.route("/api")
@@ -97,7 +272,17 @@ def api_root():
     return {"message": "InclusiCity backend running"}
 
 # -------------------- Socket.IO Init --------------------
-socketio.init_app(app, cors_allowed_origins="*", async_mode="eventlet")
+# Redis message_queue lets several workers (and the Celery sweeper)
+# emit to clients connected anywhere; voice presence lives in Redis too
+socketio.init_app(
+    app,
+    cors_allowed_origins="*",
+    async_mode="eventlet",
+    message_queue=os.getenv("SOCKETIO_MESSAGE_QUEUE") or os.getenv("REDIS_URL")
+)
 
 if __name__ == "__main__":
+    from routes.voice import start_presence_heartbeat
+
+    start_presence_heartbeat()
     socketio.run(app, host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
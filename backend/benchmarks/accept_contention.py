@@ -0,0 +1,96 @@
+"""
+Fire many simultaneous accepts at one pending request.
+
+Usage (from backend/, with MONGO_URI pointing at a scratch database):
+    python -m benchmarks.accept_contention --helpers 300
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app import app, mongo
+from routes.auth import generate_jwt
+
+BENCH_CITY = "__bench_accept__"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--helpers", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=64)
+    args = parser.parse_args()
+
+    db = mongo.db
+
+    with app.app_context():
+        request_id = db.requests.insert_one({
+            "user_id": ObjectId(),
+            "city": BENCH_CITY,
+            "pickup_address": "A",
+            "destination_address": "B",
+            "need": "bench",
+            "phone": "0",
+            "needed_at": datetime.utcnow() + timedelta(hours=1),
+            "status": "pending",
+            "helper_id": None,
+            "created_at": datetime.utcnow()
+        }).inserted_id
+
+        helper_ids = db.helpers.insert_many([
+            {
+                "name": f"bench-{i}",
+                "email": f"bench-{i}@bench.local",
+                "city": BENCH_CITY,
+                "verified": True,
+                "available": True,
+                "role": "helper"
+            }
+            for i in range(args.helpers)
+        ]).inserted_ids
+
+        tokens = [
+            generate_jwt({"user_id": str(h), "email": "", "role": "helper"})
+            for h in helper_ids
+        ]
+
+    client = app.test_client()
+    url = f"/requests/{request_id}/accept"
+
+    def accept(token):
+        return client.patch(
+            url, headers={"Authorization": f"Bearer {token}"}
+        ).status_code
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            codes = list(pool.map(accept, tokens))
+        elapsed = time.perf_counter() - started
+
+        winners = codes.count(200)
+        busy = db.helpers.count_documents(
+            {"_id": {"$in": helper_ids}, "available": False}
+        )
+        req = db.requests.find_one({"_id": request_id})
+
+        print(f"accepts:      {len(codes)}")
+        print(f"elapsed:      {elapsed:.3f}s")
+        print(f"throughput:   {len(codes) / elapsed:.1f} req/s")
+        print(f"winners:      {winners}")
+        print(f"busy helpers: {busy}")
+        print(f"status:       {req['status']}")
+
+        ok = winners == 1 and busy == 1 and req["status"] == "accepted"
+        print("✅ exactly one helper won" if ok else "❌ contention bug")
+        raise SystemExit(0 if ok else 1)
+
+    finally:
+        db.requests.delete_one({"_id": request_id})
+        db.helpers.delete_many({"_id": {"$in": helper_ids}})
+
+
+if __name__ == "__main__":
+    main()
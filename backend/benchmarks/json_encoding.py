@@ -0,0 +1,141 @@
+"""
+Compare list-endpoint serialization: stdlib jsonify with hand-converted
+ObjectIds (old) vs the real app's JSON provider with native BSON
+handling (new). First checks, through app.test_client(), that the app
+actually serializes ObjectId / datetime as plain strings (flask_pymongo
+installs its own provider, which must not win).
+
+Usage (from backend/):
+    MONGO_ENSURE_INDEXES=false python -m benchmarks.json_encoding --items 10000
+"""
+import argparse
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from utils.json_provider import MongoJSONProvider, orjson
+
+
+def check_app_provider(app):
+    """Round-trip a BSON payload through the real app's response path."""
+    oid = ObjectId()
+    created_at = datetime(2026, 1, 1, 12, 0)
+
+    app.add_url_rule(
+        "/__json_check", "json_check",
+        lambda: jsonify({"request_id": oid, "created_at": created_at})
+    )
+    body = app.test_client().get("/__json_check").get_json()
+
+    assert isinstance(app.json, MongoJSONProvider), type(app.json).__name__
+    assert body == {
+        "request_id": str(oid),
+        "created_at": "2026-01-01T12:00:00+00:00"
+    }, body
+    print("✅ app serializes ObjectId / datetime as strings")
+
+
+def sample_requests(n):
+    return [
+        {
+            "_id": ObjectId(),
+            "city": "Chennai",
+            "pickup_address": "12 Anna Salai",
+            "destination_address": "Central Station",
+            "need": "wheelchair assistance",
+            "phone": "9876543210",
+            "needed_date": "2026-10-18",
+            "needed_time": "09:30",
+            "status": "completed",
+            "is_rated": True,
+            "helper_name": "Helper",
+            "created_at": datetime.utcnow()
+        }
+        for _ in range(n)
+    ]
+
+
+def sample_sos(n):
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": str(ObjectId()),
+            "email": "user@example.com",
+            "role": "user",
+            "message": "Emergency SOS triggered",
+            "status": "active",
+            "created_at": datetime.utcnow()
+        }
+        for _ in range(n)
+    ]
+
+
+def sample_helpers(n):
+    return [
+        {
+            "_id": ObjectId(),
+            "name": "Helper",
+            "email": "helper@example.com",
+            "city": "Chennai",
+            "skills": ["wheelchair", "visual"],
+            "documents": {
+                "id_proof": {"filename": "id.pdf", "path": "blobs/ab/abcd.pdf", "size": 120000},
+                "ngo_certificate": {"filename": "ngo.pdf", "path": "blobs/cd/cdef.pdf", "size": 98000}
+            }
+        }
+        for _ in range(n)
+    ]
+
+
+def old_style(docs, id_key="_id"):
+    # what the handlers used to do before jsonify
+    out = []
+    for d in docs:
+        d = dict(d)
+        d[id_key] = str(d[id_key])
+        out.append(d)
+    return out
+
+
+def bench(app, build_payload, rounds):
+    with app.app_context():
+        started = time.perf_counter()
+        for _ in range(rounds):
+            body = jsonify(build_payload()).get_data()
+        elapsed = (time.perf_counter() - started) / rounds
+    return elapsed * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    old_app = Flask("old")
+    old_app.json = DefaultJSONProvider(old_app)
+
+    from app import app as new_app
+
+    check_app_provider(new_app)
+
+    payloads = {
+        "/requests/my": sample_requests(args.items),
+        "/admin/sos": sample_sos(args.items),
+        "/admin/helpers/pending": sample_helpers(args.items),
+    }
+
+    print(f"encoder: {'orjson' if orjson else 'stdlib json (orjson not installed)'}")
+    print(f"{'endpoint':<26}{'old ms':>10}{'new ms':>10}{'speedup':>10}{'bytes':>12}")
+
+    for endpoint, docs in payloads.items():
+        old_ms, _ = bench(old_app, lambda: {"items": old_style(docs)}, args.rounds)
+        new_ms, size = bench(new_app, lambda: {"items": docs}, args.rounds)
+        print(f"{endpoint:<26}{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / new_ms:>9.1f}x{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Simulate a mass reconnect (network blip) against the voice presence store.
+
+Compares the old disconnect path (scan every room for the sid) with
+leave_all() driven by the sid -> rooms reverse index. Uses Redis when
+REDIS_URL is set, otherwise the in-memory store.
+
+Usage (from backend/):
+    python -m benchmarks.voice_disconnect_storm --rooms 200 --clients 2000
+"""
+import argparse
+import os
+import random
+import time
+
+from utils.presence import MemoryPresenceStore, create_presence_store
+
+
+def scan_disconnect(room_users, sid):
+    # pre-index behaviour: rooms × clients work per storm
+    for room in list(room_users):
+        if sid in room_users[room]:
+            del room_users[room][sid]
+            if not room_users[room]:
+                del room_users[room]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--drop", type=float, default=0.5,
+                        help="fraction of clients dropped by the blip")
+    args = parser.parse_args()
+
+    rooms = [f"bench-{i}" for i in range(args.rooms)]
+    placement = {
+        f"sid-{i}": random.choice(rooms) for i in range(args.clients)
+    }
+    dropped = random.sample(list(placement), int(args.clients * args.drop))
+
+    # --- old: module-level dict, scan on disconnect
+    room_users = {}
+    for sid, room in placement.items():
+        room_users.setdefault(room, {})[sid] = {"name": sid, "role": "user"}
+
+    started = time.perf_counter()
+    for sid in dropped:
+        scan_disconnect(room_users, sid)
+    scan_s = time.perf_counter() - started
+
+    # --- new: presence store with reverse index
+    store = create_presence_store() if os.getenv("REDIS_URL") else MemoryPresenceStore()
+    backend = type(store).__name__
+    for sid, room in placement.items():
+        store.join(room, sid, {"name": sid, "role": "user"})
+
+    started = time.perf_counter()
+    for sid in dropped:
+        store.leave_all(sid)
+    indexed_s = time.perf_counter() - started
+
+    # clients come straight back (the "reconnect" half of the storm)
+    started = time.perf_counter()
+    for sid in dropped:
+        store.join(placement[sid], sid, {"name": sid, "role": "user"})
+    rejoin_s = time.perf_counter() - started
+
+    for sid in placement:
+        store.leave_all(sid)
+
+    n = len(dropped)
+    print(f"store:               {backend}")
+    print(f"rooms / clients:     {args.rooms} / {args.clients} ({n} dropped)")
+    print(f"scan disconnect:     {scan_s * 1000:.1f} ms ({n / scan_s:,.0f}/s)")
+    print(f"indexed disconnect:  {indexed_s * 1000:.1f} ms ({n / indexed_s:,.0f}/s)")
+    print(f"rejoin:              {rejoin_s * 1000:.1f} ms ({n / rejoin_s:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
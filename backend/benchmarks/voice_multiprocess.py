@@ -0,0 +1,157 @@
+"""
+Check voice-room presence and WebRTC signalling across two Socket.IO workers.
+
+Starts two server processes sharing a local Redis (presence store +
+message_queue), connects one client to each and verifies joins, leaves
+and offer/answer/ice_candidate relays cross the worker boundary, and
+that a killed worker's members are purged by the survivor.
+
+Requires a running Redis and the python-socketio client.
+
+Usage (from backend/):
+    REDIS_URL=redis://localhost:6379/15 JWT_SECRET_KEY=dev \\
+        python -m benchmarks.voice_multiprocess
+"""
+import os
+import queue
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import jwt
+import redis
+import socketio
+
+PORTS = [5101, 5102]
+ROOM = "music"
+TIMEOUT = 5
+WORKER_TTL_SECONDS = 2
+
+
+def start_worker(port):
+    env = {
+        **os.environ,
+        "MONGO_ENSURE_INDEXES": "false",
+        "VOICE_PRESENCE_WORKER_TTL_SECONDS": str(WORKER_TTL_SECONDS)
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-c",
+            "import eventlet; eventlet.monkey_patch(); "
+            "from app import app, socketio; "
+            f"socketio.run(app, host='127.0.0.1', port={port})"
+        ],
+        env=env
+    )
+
+
+def make_token(email):
+    return jwt.encode(
+        {
+            "user_id": "000000000000000000000000",
+            "email": email,
+            "role": "user",
+            "exp": datetime.utcnow() + timedelta(hours=1)
+        },
+        os.environ["JWT_SECRET_KEY"],
+        algorithm="HS256"
+    )
+
+
+class Client:
+    EVENTS = ["room_users", "member_added", "member_removed", "offer", "answer", "ice_candidate"]
+
+    def __init__(self, port, email):
+        self.sio = socketio.Client()
+        self.events = queue.Queue()
+        self.token = make_token(email)
+
+        for event in self.EVENTS:
+            self.sio.on(event, self._recorder(event))
+
+        self.sio.connect(f"http://127.0.0.1:{port}", transports=["websocket"])
+
+    def _recorder(self, event):
+        return lambda data: self.events.put((event, data))
+
+    def expect(self, event, check=lambda data: True, timeout=TIMEOUT):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                name, data = self.events.get(timeout=deadline - time.time())
+            except queue.Empty:
+                break
+            if name == event and check(data):
+                return data
+        raise AssertionError(f"{self.sio.sid}: did not receive {event}")
+
+
+def main():
+    r = redis.Redis.from_url(os.environ["REDIS_URL"])
+    for key in r.scan_iter("voice:*"):
+        r.delete(key)
+
+    workers = [start_worker(port) for port in PORTS]
+    try:
+        time.sleep(3)
+
+        a = Client(PORTS[0], "alice@example.com")
+        b = Client(PORTS[1], "bob@example.com")
+
+        a.sio.emit("join_room", {"room": ROOM, "token": a.token})
+        a.expect("room_users", lambda d: len(d["users"]) == 1)
+
+        b.sio.emit("join_room", {"room": ROOM, "token": b.token})
+        b.expect("room_users", lambda d: len(d["users"]) == 2)
+        a.expect("member_added", lambda d: d["member"]["sid"] == b.sio.sid)
+        print("✅ join visible across workers")
+
+        a.sio.emit("offer", {"to": b.sio.sid, "offer": {"sdp": "o"}})
+        b.expect("offer", lambda d: d["from"] == a.sio.sid)
+        b.sio.emit("answer", {"to": a.sio.sid, "answer": {"sdp": "a"}})
+        a.expect("answer", lambda d: d["from"] == b.sio.sid)
+        a.sio.emit("ice_candidate", {"to": b.sio.sid, "candidate": {"c": 1}})
+        b.expect("ice_candidate", lambda d: d["from"] == a.sio.sid)
+        print("✅ offer / answer / ice_candidate relayed across workers")
+
+        b.sio.emit("leave_room", {"room": ROOM})
+        a.expect("member_removed", lambda d: d["sid"] == b.sio.sid)
+        print("✅ leave visible across workers")
+
+        a.sio.disconnect()
+        b.sio.disconnect()
+        time.sleep(1)
+
+        assert not r.exists(f"voice:room:{ROOM}"), "presence not cleaned up"
+        print("✅ presence cleaned up on disconnect")
+
+        # Worker killed without disconnects → survivor purges its members
+        a = Client(PORTS[0], "alice@example.com")
+        b = Client(PORTS[1], "bob@example.com")
+        a.sio.emit("join_room", {"room": ROOM, "token": a.token})
+        a.expect("room_users")
+        b.sio.emit("join_room", {"room": ROOM, "token": b.token})
+        b.expect("room_users", lambda d: len(d["users"]) == 2)
+
+        ghost = a.sio.sid
+        workers[0].kill()
+        workers[0].wait()
+
+        b.expect(
+            "member_removed",
+            lambda d: d["sid"] == ghost,
+            timeout=WORKER_TTL_SECONDS * 2 + TIMEOUT
+        )
+        a.sio.disconnect()  # stop reconnect attempts to the dead worker
+        b.sio.disconnect()
+        print("✅ killed worker's members purged by the survivor")
+
+    finally:
+        for w in workers:
+            w.terminate()
+            w.wait()
+
+
+if __name__ == "__main__":
+    main()
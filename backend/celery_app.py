@@ -12,6 +12,9 @@ celery_app = Celery(
 
 # 🔥 EXPLICIT TASK REGISTRATION (BEST FOR FLASK PROJECTS)
 from utils import email_tasks  # noqa: F401
+from utils import expiry_tasks  # noqa: F401
+from utils import counters_tasks  # noqa: F401
+from utils import upload_tasks  # noqa: F401
 
 celery_app.conf.update(
     task_serializer="json",
@@ -19,4 +22,16 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    beat_schedule={
+        # 🔥 Move pending → expired off the read path
+        "expire-due-requests": {
+            "task": "requests.expire_due",
+            "schedule": float(os.getenv("EXPIRY_SWEEP_INTERVAL_SECONDS", 60)),
+        },
+        # 🔥 Repair any drift in the write-maintained stats counters
+        "reconcile-counters": {
+            "task": "counters.reconcile",
+            "schedule": float(os.getenv("COUNTERS_RECONCILE_INTERVAL_SECONDS", 3600)),
+        },
+    },
 )
@@ -1,8 +1,17 @@
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, jsonify, current_app, request, stream_with_context
 from flask_restx import Namespace, Resource, fields
 from bson import ObjectId
 from utils.email import send_helper_verified_email
 from routes.auth import jwt_required, role_required
+from routes.live import notify_sos_resolved
+from routes.voice import invalidate_voice_rooms
+from utils.counters import incr, read_counters
+from utils.mongo_metrics import endpoint_stats
+from utils.voice_rooms import ROOM_NAME
+from utils.pagination import (
+    InvalidCursor, KEYSET_SORT, cursor_phase, keyset_filter, next_cursor,
+    parse_limit
+)
 from datetime import datetime
 
 # =========================================================
@@ -26,6 +35,9 @@ def get_db():
     return mongo.db
 
 
+SOS_STATUSES = ["active", "resolved"]
+
+
 # =========================================================
 # Swagger Models
 # =========================================================
@@ -62,12 +74,15 @@ stats_model = admin_ns.model("PlatformStats", {
 @role_required("admin")
 def pending_helpers():
     db = get_db()
-    helpers = db.helpers.find({"verified": False})
+    helpers = db.helpers.find(
+        {"verified": False},
+        {"name": 1, "email": 1, "city": 1, "skills": 1, "documents": 1}
+    )
 
     result = []
     for h in helpers:
         result.append({
-            "id": str(h["_id"]),
+            "id": h["_id"],
             "name": h["name"],
             "email": h["email"],
             "city": h["city"],
@@ -99,11 +114,14 @@ def verify_helper_admin(helper_id):
         return jsonify({"message": "Helper already verified"}), 200
 
     # Mark helper as verified
-    db.helpers.update_one(
-        {"_id": helper["_id"]},
+    result = db.helpers.update_one(
+        {"_id": helper["_id"], "verified": False},
         {"$set": {"verified": True}}
     )
 
+    if result.modified_count:
+        incr(db, verified_helpers=1, pending_helpers=-1)
+
     # 🔔 Send verification email (ASYNC with fallback)
     try:
         from utils.email_tasks import send_helper_verified_email_task
@@ -135,34 +153,84 @@ def verify_helper_admin(helper_id):
 def platform_stats():
     db = get_db()
 
-    stats = {
-        "total_users": db.users.count_documents({}),
-        "total_helpers": db.helpers.count_documents({}),
-        "verified_helpers": db.helpers.count_documents({"verified": True}),
-        "pending_helpers": db.helpers.count_documents({"verified": False}),
-        "total_requests": db.requests.count_documents({}),
-        "completed_requests": db.requests.count_documents({"status": "completed"}),
-        "active_requests": db.requests.count_documents({"status": "accepted"})
-    }
-
-    return jsonify(stats), 200
+    # 🔥 Single document fetch (kept up to date on every state transition)
+    return jsonify(read_counters(db)), 200
+
+
+@admin_bp.route("/metrics/mongo", methods=["GET"])
+@jwt_required
+@role_required("admin")
+def mongo_metrics():
+    # Per-endpoint Mongo query count / latency since process start
+    return jsonify(endpoint_stats()), 200
+
+
 @admin_bp.route("/sos", methods=["GET"])
 @jwt_required
 @role_required("admin")
 def get_all_sos():
     db = get_db()
 
-    sos_list = list(
-        db.sos_alerts.find().sort("created_at", -1)
-    )
+    status = request.args.get("status")
+    if status and status not in SOS_STATUSES:
+        return jsonify({"error": "Invalid status"}), 400
+
+    limit = parse_limit(request.args.get("limit"))
+
+    try:
+        after = keyset_filter(request.args.get("cursor"))
+        phase = cursor_phase(request.args.get("cursor"))
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    if status:
+        segments = [(None, {"status": status})]
+    else:
+        # Unfiltered: active alerts first, then the rest, each newest first;
+        # the cursor remembers which segment it stopped in
+        segments = [
+            ("active", {"status": "active"}),
+            ("rest", {"status": {"$ne": "active"}})
+        ]
+        if phase == "rest":
+            segments = segments[1:]
+
+    def segment_cursors():
+        for i, (name, query) in enumerate(segments):
+            # cursor position only applies to the segment it came from
+            if i == 0:
+                query = {**query, **after}
+            yield name, db.sos_alerts.find(query).sort(KEYSET_SORT)
+
+    # 🔥 NDJSON: stream straight from the Mongo cursors, no materialization
+    if request.args.get("format") == "ndjson":
+        def generate():
+            for _, cursor in segment_cursors():
+                for sos in cursor:
+                    yield current_app.json.dumps(sos) + "\n"
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="application/x-ndjson"
+        )
 
-    # Convert ObjectId → string
-    for sos in sos_list:
-        sos["_id"] = str(sos["_id"])
+    # ObjectId / datetime handled by the app's JSON provider
+    sos_list = []
+    last_phase = None
+    for name, cursor in segment_cursors():
+        batch = list(cursor.limit(limit - len(sos_list)))
+        sos_list.extend(batch)
+        if batch:
+            last_phase = name
+        if len(sos_list) >= limit:
+            break
 
     return jsonify({
-        "sos": sos_list
+        "sos": sos_list,
+        "next_cursor": next_cursor(sos_list, limit, last_phase)
     }), 200
+
+
 @admin_bp.route("/sos/<sos_id>/resolve", methods=["PATCH"])
 @jwt_required
 @role_required("admin")
@@ -182,9 +250,74 @@ def resolve_sos(sos_id):
     if result.matched_count == 0:
         return jsonify({"error": "SOS not found"}), 404
 
+    notify_sos_resolved(sos_id)
+
     return jsonify({"message": "SOS resolved successfully"}), 200
 
 
+# =========================================================
+# VOICE ROOMS (catalogue + capacity)
+# =========================================================
+@admin_bp.route("/voice-rooms", methods=["GET"])
+@jwt_required
+@role_required("admin")
+def list_voice_rooms():
+    db = get_db()
+    rooms = list(db.voice_rooms.find().sort("_id", 1))
+    return jsonify({"rooms": rooms}), 200
+
+
+@admin_bp.route("/voice-rooms/<name>", methods=["PUT"])
+@jwt_required
+@role_required("admin")
+def upsert_voice_room(name):
+    db = get_db()
+    data = request.get_json() or {}
+
+    if not ROOM_NAME.match(name):
+        return jsonify({
+            "error": "Room name must be 1-32 lowercase letters, digits or _"
+        }), 400
+
+    try:
+        max_participants = int(data.get("max_participants", 8))
+        if max_participants < 2:
+            raise ValueError
+    except (TypeError, ValueError):
+        return jsonify({"error": "max_participants must be at least 2"}), 400
+
+    active = data.get("active", True)
+    if not isinstance(active, bool):
+        return jsonify({"error": "active must be true or false"}), 400
+
+    db.voice_rooms.update_one(
+        {"_id": name},
+        {"$set": {
+            "description": data.get("description", ""),
+            "max_participants": max_participants,
+            "active": active
+        }},
+        upsert=True
+    )
+    invalidate_voice_rooms()
+
+    return jsonify({"message": "Voice room saved"}), 200
+
+
+@admin_bp.route("/voice-rooms/<name>", methods=["DELETE"])
+@jwt_required
+@role_required("admin")
+def delete_voice_room(name):
+    db = get_db()
+
+    result = db.voice_rooms.delete_one({"_id": name})
+    if result.deleted_count == 0:
+        return jsonify({"error": "Voice room not found"}), 404
+
+    invalidate_voice_rooms()
+    return jsonify({"message": "Voice room deleted"}), 200
+
+
 # =========================================================
 # Swagger Wrapper Routes (NO LOGIC DUPLICATION)
 # =========================================================
@@ -1,13 +1,19 @@
 import jwt
-import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 from flask import Blueprint, request, jsonify, current_app
 from flask_restx import Namespace, Resource, fields
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
 from datetime import datetime, timedelta
 from bson import ObjectId
 
+from utils.accounts import reserve_email, release_email, resolve_account
+from utils.counters import incr
+from utils.uploads import UploadTooLarge, store_upload
+
 # =========================================================
 # Blueprint & Swagger Namespace
 # =========================================================
@@ -43,12 +49,55 @@ def generate_jwt(payload):
     )
 
 
+# =========================================================
+# Verified-token cache (shared by HTTP + Socket.IO)
+# token digest -> (claims, exp); LRU-bounded, entries die at exp
+# =========================================================
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
 def decode_jwt(token):
-    return jwt.decode(
+    if not isinstance(token, str):
+        # same error jwt.decode raises for a missing / non-string token
+        raise jwt.DecodeError("Invalid token type")
+
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry and entry[1] > now:
+            _token_cache.move_to_end(key)
+            _token_cache_stats["hits"] += 1
+            return dict(entry[0])
+        if entry:
+            # expired → drop and let jwt.decode raise ExpiredSignatureError
+            del _token_cache[key]
+        _token_cache_stats["misses"] += 1
+
+    claims = jwt.decode(
         token,
         current_app.config["JWT_SECRET_KEY"],
         algorithms=[current_app.config["JWT_ALGORITHM"]]
     )
+
+    if "exp" in claims:
+        with _token_cache_lock:
+            _token_cache[key] = (claims, claims["exp"])
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > current_app.config.get("JWT_CACHE_SIZE", 10000):
+                _token_cache.popitem(last=False)
+                _token_cache_stats["evictions"] += 1
+
+    return dict(claims)
+
+
+def token_cache_stats():
+    with _token_cache_lock:
+        return {**_token_cache_stats, "size": len(_token_cache)}
+
 def decode_jwt_from_socket(token):
     try:
         return decode_jwt(token)
@@ -147,15 +196,18 @@ def signup_user():
 
     email = data["email"].strip().lower()
 
-    if db.users.find_one({"email": email}) or db.helpers.find_one({"email": email}):
-        return jsonify({"error": "Email already exists"}), 409
-
     try:
         age = int(data["age"])
     except ValueError:
         return jsonify({"error": "Age must be a number"}), 400
 
+    # 🔒 One insert both checks and claims the email
+    user_id = ObjectId()
+    if not reserve_email(db, email, "user", "users", user_id):
+        return jsonify({"error": "Email already exists"}), 409
+
     user = {
+        "_id": user_id,
         "name": data["name"],
         "email": email,
         "password": generate_password_hash(data["password"]),
@@ -167,7 +219,13 @@ def signup_user():
         "created_at": datetime.utcnow()
     }
 
-    db.users.insert_one(user)
+    try:
+        db.users.insert_one(user)
+    except Exception:
+        release_email(db, email)
+        raise
+    incr(db, total_users=1)
+
     return jsonify({"message": "User registered successfully"}), 201
 
 
@@ -197,9 +255,6 @@ def signup_helper():
 
     email = form["email"].strip().lower()
 
-    if db.users.find_one({"email": email}) or db.helpers.find_one({"email": email}):
-        return jsonify({"error": "Email already exists"}), 409
-
     # Age validation
     try:
         age = int(form["age"])
@@ -216,26 +271,26 @@ def signup_helper():
     # ✅ HARD-CODE NGO ID (SAFE)
     DEFAULT_NGO_ID = "ngo_12345"
 
-    # File storage
+    # 🔒 One insert both checks and claims the email
     helper_id = ObjectId()
-    base_path = os.path.join(
-        current_app.config["UPLOAD_FOLDER"],
-        "helpers",
-        str(helper_id)
-    )
-    os.makedirs(base_path, exist_ok=True)
-
-    id_file = files["id_proof"]
-    ngo_file = files["ngo_certificate"]
-
-    id_filename = secure_filename(id_file.filename)
-    ngo_filename = secure_filename(ngo_file.filename)
+    if not reserve_email(db, email, "helper", "helpers", helper_id):
+        return jsonify({"error": "Email already exists"}), 409
 
-    id_path = os.path.join(base_path, id_filename)
-    ngo_path = os.path.join(base_path, ngo_filename)
+    # File storage (streamed, size-capped, content-addressed)
+    upload_root = current_app.config["UPLOAD_FOLDER"]
+    max_bytes = current_app.config["UPLOAD_MAX_BYTES"]
 
-    id_file.save(id_path)
-    ngo_file.save(ngo_path)
+    try:
+        documents = {
+            kind: store_upload(files[kind], upload_root, max_bytes)
+            for kind in ("id_proof", "ngo_certificate")
+        }
+    except UploadTooLarge as e:
+        release_email(db, email)
+        return jsonify({"error": str(e)}), 413
+    except Exception:
+        release_email(db, email)
+        raise
 
     # DB insert
     helper = {
@@ -249,18 +304,7 @@ def signup_helper():
         "skills": skills,
         "ngo_id": DEFAULT_NGO_ID,
 
-"documents": {
-"id_proof": {
-    "filename": id_filename,
-    "path": f"helpers/{helper_id}/{id_filename}"
-},
-"ngo_certificate": {
-    "filename": ngo_filename,
-    "path": f"helpers/{helper_id}/{ngo_filename}"
-}
-
-}
-,
+        "documents": documents,
 
         "verified": False,
         "available": False,
@@ -268,7 +312,21 @@ def signup_helper():
         "created_at": datetime.utcnow()
     }
 
-    db.helpers.insert_one(helper)
+    try:
+        db.helpers.insert_one(helper)
+    except Exception:
+        release_email(db, email)
+        raise
+    incr(db, total_helpers=1, pending_helpers=1)
+
+    # 🖼️ Thumbnails for the admin review screen (ASYNC, best effort)
+    try:
+        from utils.upload_tasks import generate_document_thumbnail_task
+
+        for kind, doc in documents.items():
+            generate_document_thumbnail_task.delay(str(helper_id), kind, doc["path"])
+    except Exception as e:
+        print("⚠️ Thumbnail task not queued:", e)
 
     return jsonify({
         "message": "Helper application submitted. Await admin verification."
@@ -290,16 +348,10 @@ def login():
     if not email or not password:
         return jsonify({"error": "Email and password required"}), 400
 
-    # USERS (user + admin)
-    account = db.users.find_one({"email": email})
-    if account:
-        role = account["role"]   # ❗ NO DEFAULT
-    else:
-        # HELPERS
-        account = db.helpers.find_one({"email": email})
-        if not account:
-            return jsonify({"error": "Invalid credentials"}), 401
-        role = "helper"
+    # USERS (user + admin) / HELPERS via the email index
+    account, role = resolve_account(db, email)
+    if not account:
+        return jsonify({"error": "Invalid credentials"}), 401
 
     if not check_password_hash(account["password"], password):
         return jsonify({"error": "Invalid credentials"}), 401
@@ -351,6 +403,11 @@ def toggle_availability():
         {"$set": {"available": data["available"]}}
     )
 
+    if data["available"] is False:
+        from routes.live import evict_from_helper_feed  # live imports auth
+
+        evict_from_helper_feed(helper_id)
+
     return jsonify({
         "message": "Availability updated",
         "available": data["available"]
@@ -386,6 +443,13 @@ def me():
     }), 200
 
 
+@auth_bp.route("/token-cache", methods=["GET"])
+@jwt_required
+@role_required("admin")
+def token_cache():
+    return jsonify(token_cache_stats()), 200
+
+
 # =========================================================
 # Swagger Wrapper Routes (NO LOGIC DUPLICATION)
 # =========================================================
@@ -0,0 +1,176 @@
+import json
+
+from bson import ObjectId
+from flask import current_app, request
+from flask_socketio import join_room, leave_room, rooms, emit
+
+from routes.auth import decode_jwt_from_socket, get_db
+from routes.voice import presence, socketio
+
+ADMINS_ROOM = "admins"
+
+# helper_id -> {sid: city} of feed subscribers, so the server can evict
+# them when they stop being available (Redis hash when presence uses Redis)
+FEED_SIDS_TTL_SECONDS = 24 * 3600
+_feed_sids = {}
+
+
+# =========================================================
+# ADMINS ROOM (SOS push)
+# =========================================================
+@socketio.on("join_admins")
+def handle_join_admins(data):
+    payload = decode_jwt_from_socket((data or {}).get("token"))
+
+    if not payload or payload.get("role") != "admin":
+        emit("error", {"msg": "Admins only"})
+        return
+
+    join_room(ADMINS_ROOM)
+    print(f"Admin {payload.get('email')} ({request.sid}) joined {ADMINS_ROOM}")
+
+
+def _serialize_sos(sos):
+    # Same encoding as the HTTP path (ObjectId → str, UTC datetimes with
+    # offset) so pushed and fetched alerts render identically
+    return json.loads(current_app.json.dumps(sos))
+
+
+def notify_sos_created(sos):
+    socketio.emit("sos_created", _serialize_sos(sos), to=ADMINS_ROOM)
+
+
+def notify_sos_resolved(sos_id):
+    socketio.emit("sos_resolved", {"_id": str(sos_id)}, to=ADMINS_ROOM)
+
+
+# =========================================================
+# HELPER FEED (per-city request deltas)
+# =========================================================
+def city_room(city):
+    return f"city:{city}"
+
+
+@socketio.on("join_helper_feed")
+def handle_join_helper_feed(data):
+    payload = decode_jwt_from_socket((data or {}).get("token"))
+
+    if not payload or payload.get("role") != "helper":
+        emit("error", {"msg": "Helpers only"})
+        return
+
+    helper = get_db().helpers.find_one(
+        {"_id": ObjectId(payload["user_id"])},
+        {"city": 1, "available": 1}
+    )
+    if not helper:
+        emit("error", {"msg": "Helper not found"})
+        return
+
+    # same gate as GET /requests/available (feed carries phone + addresses)
+    if not helper.get("available"):
+        emit("error", {"msg": "Helper not available"})
+        return
+
+    room = city_room(helper["city"])
+    _track_feed_sid(payload["user_id"], request.sid, helper["city"])
+    join_room(room)
+
+    # accepted / went offline between the check and the join → undo
+    if not get_db().helpers.find_one(
+        {"_id": helper["_id"], "available": True}, {"_id": 1}
+    ):
+        leave_room(room)
+        emit("error", {"msg": "Helper not available"})
+        return
+
+    emit("helper_feed_joined", {"city": helper["city"]})
+    print(f"Helper {payload.get('email')} ({request.sid}) joined {room}")
+
+
+@socketio.on("leave_helper_feed")
+def handle_leave_helper_feed(data=None):
+    for room in rooms():
+        if room.startswith("city:"):
+            leave_room(room)
+
+
+def _feed_key(helper_id):
+    return f"helperfeed:{helper_id}"
+
+
+def _track_feed_sid(helper_id, sid, city):
+    redis_client = getattr(presence, "redis", None)
+    if redis_client is None:
+        _feed_sids.setdefault(str(helper_id), {})[sid] = city
+        return
+
+    pipe = redis_client.pipeline()
+    pipe.hset(_feed_key(helper_id), sid, city)
+    pipe.expire(_feed_key(helper_id), FEED_SIDS_TTL_SECONDS)
+    pipe.execute()
+
+
+def _pop_feed_sids(helper_id):
+    redis_client = getattr(presence, "redis", None)
+    if redis_client is None:
+        return _feed_sids.pop(str(helper_id), {})
+
+    pipe = redis_client.pipeline()
+    pipe.hgetall(_feed_key(helper_id))
+    pipe.delete(_feed_key(helper_id))
+    entries, _ = pipe.execute()
+    return {
+        (sid.decode() if isinstance(sid, bytes) else sid):
+            (city.decode() if isinstance(city, bytes) else city)
+        for sid, city in entries.items()
+    }
+
+
+def evict_from_helper_feed(helper_id):
+    """
+    Helper became busy / unavailable: drop all their sockets from the
+    city feed server-side (leave_room reaches sids on other workers
+    through the message queue).
+    """
+    for sid, city in _pop_feed_sids(helper_id).items():
+        socketio.server.leave_room(sid, city_room(city), namespace="/")
+        socketio.emit("helper_feed_closed", {"city": city}, to=sid)
+
+
+def notify_request_created(req, user_name):
+    socketio.emit("request_created", {
+        "request_id": str(req["_id"]),
+        "city": req["city"],
+        "pickup_address": req.get("pickup_address"),
+        "destination_address": req.get("destination_address"),
+        "need": req["need"],
+        "phone": req.get("phone"),
+        "needed_date": req.get("needed_date"),
+        "needed_time": req.get("needed_time"),
+        "user_name": user_name
+    }, to=city_room(req["city"]))
+
+
+def notify_request_taken(city, request_id):
+    socketio.emit(
+        "request_taken", {"request_id": str(request_id)}, to=city_room(city)
+    )
+
+
+def notify_request_cancelled(city, request_id):
+    socketio.emit(
+        "request_cancelled", {"request_id": str(request_id)}, to=city_room(city)
+    )
+
+
+def notify_requests_expired(requests):
+    """One request_expired event per city for a batch of expired requests."""
+    by_city = {}
+    for r in requests:
+        by_city.setdefault(r["city"], []).append(str(r["_id"]))
+
+    for city, request_ids in by_city.items():
+        socketio.emit(
+            "request_expired", {"request_ids": request_ids}, to=city_room(city)
+        )
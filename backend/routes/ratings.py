@@ -1,9 +1,14 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_restx import Namespace, Resource, fields
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 
 from routes.auth import jwt_required, role_required
+from utils.pagination import (
+    InvalidCursor, KEYSET_SORT, keyset_filter, next_cursor, parse_limit
+)
+from utils.ratings import add_rating, helper_rating_aggregates
 
 # =========================================================
 # Blueprint & Swagger Namespace
@@ -26,6 +31,12 @@ def get_db():
     return mongo.db
 
 
+def _avg_rating(helper):
+    if not helper or not helper.get("total_reviews") or helper.get("rating_sum") is None:
+        return None
+    return round(helper["rating_sum"] / helper["total_reviews"], 2)
+
+
 # =========================================================
 # Swagger Models
 # =========================================================
@@ -44,7 +55,9 @@ rating_item_model = ratings_ns.model("RatingItem", {
 my_ratings_response_model = ratings_ns.model("MyRatingsResponse", {
     "total_reviews": fields.Integer,
     "avg_rating": fields.Float,
-    "ratings": fields.List(fields.Nested(rating_item_model))
+    "rating_histogram": fields.Raw,
+    "ratings": fields.List(fields.Nested(rating_item_model)),
+    "next_cursor": fields.String
 })
 
 
@@ -93,29 +106,17 @@ def rate_helper():
         "created_at": datetime.utcnow()
     }
 
-    db.ratings.insert_one(rating_doc)
+    # unique request_id index: a double submit loses the race here
+    try:
+        db.ratings.insert_one(rating_doc)
+    except DuplicateKeyError:
+        return jsonify({"error": "Request already rated"}), 409
 
     # =====================================================
-    # UPDATE HELPER AVERAGE RATING
+    # UPDATE HELPER AGGREGATES (O(1), atomic)
     # =====================================================
-    ratings = list(db.ratings.find({
-        "helper_id": req["helper_id"]
-    }))
-
-    avg_rating = round(
-        sum(r["rating"] for r in ratings) / len(ratings),
-        2
-    )
-
-    db.helpers.update_one(
-        {"_id": req["helper_id"]},
-        {
-            "$set": {
-                "avg_rating": avg_rating,
-                "total_reviews": len(ratings)
-            }
-        }
-    )
+    helper = add_rating(db, req["helper_id"], rating_value)
+    avg_rating = helper.get("avg_rating")
 
     return jsonify({
         "message": "Rating submitted successfully",
@@ -133,25 +134,42 @@ def view_my_ratings():
     db = get_db()
 
     helper_id = ObjectId(request.user["user_id"])
-    ratings_cursor = db.ratings.find({"helper_id": helper_id})
 
-    ratings = []
-    total = 0
+    helper = helper_rating_aggregates(db, helper_id)
+
+    limit = parse_limit(request.args.get("limit"))
+
+    try:
+        query = {"helper_id": helper_id, **keyset_filter(request.args.get("cursor"))}
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    page = list(
+        db.ratings.find(
+            query,
+            {"rating": 1, "feedback": 1, "created_at": 1}
+        ).sort(KEYSET_SORT).limit(limit)
+    )
 
-    for r in ratings_cursor:
-        ratings.append({
+    ratings = [
+        {
             "rating": r["rating"],
             "feedback": r.get("feedback"),
             "created_at": r["created_at"]
-        })
-        total += r["rating"]
+        }
+        for r in page
+    ]
 
-    avg_rating = round(total / len(ratings), 2) if ratings else None
+    histogram = helper.get("rating_histogram", {})
 
     return jsonify({
-        "total_reviews": len(ratings),
-        "avg_rating": avg_rating,
-        "ratings": ratings
+        "total_reviews": helper.get("total_reviews", 0),
+        "avg_rating": _avg_rating(helper),
+        "rating_histogram": {
+            str(star): histogram.get(str(star), 0) for star in range(1, 6)
+        },
+        "ratings": ratings,
+        "next_cursor": next_cursor(page, limit)
     }), 200
 
 
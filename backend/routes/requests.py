@@ -4,6 +4,14 @@ from datetime import datetime
 from bson import ObjectId
 
 from routes.auth import jwt_required, role_required
+from routes.live import (
+    evict_from_helper_feed, notify_request_cancelled, notify_request_created,
+    notify_request_taken
+)
+from utils.counters import incr
+from utils.pagination import (
+    InvalidCursor, KEYSET_SORT, keyset_filter, next_cursor, parse_limit
+)
 
 # =========================================================
 # Blueprint & Swagger Namespace
@@ -62,7 +70,8 @@ available_request_item_model = requests_ns.model("AvailableRequestItem", {
 })
 
 requests_list_response = requests_ns.model("RequestsListResponse", {
-    "requests": fields.List(fields.Nested(request_item_model))
+    "requests": fields.List(fields.Nested(request_item_model)),
+    "next_cursor": fields.String
 })
 
 available_requests_response = requests_ns.model("AvailableRequestsResponse", {
@@ -138,10 +147,15 @@ def create_request():
     }
 
     result = db.requests.insert_one(new_request)
+    incr(db, total_requests=1)
+
+    # 🔔 Push to available helpers in the city
+    user = db.users.find_one({"_id": user_id}, {"name": 1})
+    notify_request_created(new_request, user["name"] if user else "Unknown")
 
     return jsonify({
         "message": "Request created",
-        "request_id": str(result.inserted_id)
+        "request_id": result.inserted_id
     }), 201
 
 
@@ -164,31 +178,27 @@ def view_available_requests():
         return jsonify({"error": "Helper not available"}), 403
 
     # 🔥 Fetch pending requests in helper city
-    cursor = db.requests.find({
-        "city": helper["city"],
-        "status": "pending"
-    }).sort("needed_at", 1)
+    # (past-due rows are skipped here; the expiry sweeper flips them)
+    pending = list(
+        db.requests.find({
+            "city": helper["city"],
+            "status": "pending",
+            "needed_at": {"$gte": now}
+        }).sort("needed_at", 1)
+    )
 
-    results = []
+    # 🔥 Resolve all requester names in one batched lookup
+    user_ids = list({r["user_id"] for r in pending})
+    user_names = {
+        u["_id"]: u["name"]
+        for u in db.users.find({"_id": {"$in": user_ids}}, {"name": 1})
+    }
 
-    for r in cursor:
-        # 🔥 LAZY EXPIRY (helpers should never see expired requests)
-        if r.get("needed_at") and r["needed_at"] < now:
-            db.requests.update_one(
-                {"_id": r["_id"]},
-                {
-                    "$set": {
-                        "status": "expired",
-                        "expired_at": now
-                    }
-                }
-            )
-            continue  # ❌ do NOT show to helper
-
-        user = db.users.find_one({"_id": r["user_id"]})
+    results = []
 
+    for r in pending:
         results.append({
-            "request_id": str(r["_id"]),
+            "request_id": r["_id"],
             "city": r["city"],
             "pickup_address": r.get("pickup_address"),
             "destination_address": r.get("destination_address"),
@@ -199,7 +209,7 @@ def view_available_requests():
             "needed_date": r.get("needed_date"),
             "needed_time": r.get("needed_time"),
 
-            "user_name": user["name"] if user else "Unknown"
+            "user_name": user_names.get(r["user_id"], "Unknown")
         })
 
     return jsonify({
@@ -216,33 +226,47 @@ def accept_request(request_id):
     db = get_db()
     helper_id = ObjectId(request.user["user_id"])
 
-    helper = db.helpers.find_one({"_id": helper_id})
-    if not helper or not helper.get("available"):
-        return jsonify({"error": "Helper not available"}), 403
-
-    req = db.requests.find_one({
-        "_id": ObjectId(request_id),
-        "status": "pending"
-    })
+    now = datetime.utcnow()
 
-    if not req:
-        return jsonify({"error": "Request not found"}), 404
+    # 🔒 Claim the helper: available → busy in one conditional write
+    helper = db.helpers.find_one_and_update(
+        {"_id": helper_id, "available": True},
+        {"$set": {"available": False}},
+        projection={"_id": 1}
+    )
+    if not helper:
+        return jsonify({"error": "Helper not available"}), 403
 
-    db.requests.update_one(
-        {"_id": req["_id"]},
+    # 🔒 Claim the request: only one helper can flip it off "pending"
+    req = db.requests.find_one_and_update(
+        {
+            "_id": ObjectId(request_id),
+            "status": "pending",
+            "needed_at": {"$gte": now}
+        },
         {
             "$set": {
                 "status": "accepted",
                 "helper_id": helper_id,
-                "accepted_at": datetime.utcnow()
+                "accepted_at": now
             }
-        }
+        },
+        projection={"_id": 1, "city": 1}
     )
 
-    db.helpers.update_one(
-        {"_id": helper_id},
-        {"$set": {"available": False}}
-    )
+    if not req:
+        # Lost the race (or request gone) → release the helper
+        db.helpers.update_one(
+            {"_id": helper_id},
+            {"$set": {"available": True}}
+        )
+        return jsonify({"error": "Request not found"}), 404
+
+    # Busy now → no more new-request pushes (phone / addresses)
+    evict_from_helper_feed(helper_id)
+
+    incr(db, active_requests=1)
+    notify_request_taken(req["city"], req["_id"])
 
     return jsonify({"message": "Request accepted"}), 200
 
@@ -257,44 +281,62 @@ def my_requests():
     role = request.user["role"]
     user_id = ObjectId(request.user["user_id"])
 
-    cursor = (
-        db.requests.find({"user_id": user_id})
-        if role == "user"
-        else db.requests.find({"helper_id": user_id})
-    )
+    owner_field = "user_id" if role == "user" else "helper_id"
+    now = datetime.utcnow()
+    limit = parse_limit(request.args.get("limit"))
+
+    try:
+        match = {owner_field: user_id, **keyset_filter(request.args.get("cursor"))}
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    # 🔥 SINGLE ROUND TRIP: rating flag + helper name joined server-side
+    # (page is cut before the joins so they only run on `limit` rows)
+    page = list(db.requests.aggregate([
+        {"$match": match},
+        {"$sort": dict(KEYSET_SORT)},
+        {"$limit": limit},
+        {
+            "$lookup": {
+                "from": "ratings",
+                "let": {"rid": "$_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$request_id", "$$rid"]}}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 1}}
+                ],
+                "as": "rating"
+            }
+        },
+        {
+            "$lookup": {
+                "from": "helpers",
+                "let": {"hid": "$helper_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$hid"]}}},
+                    {"$project": {"_id": 0, "name": 1}}
+                ],
+                "as": "helper"
+            }
+        }
+    ]))
 
     results = []
-    now = datetime.utcnow()
 
-    for r in cursor:
-        # 🔥 LAZY EXPIRY
+    for r in page:
+        helper = r["helper"][0] if r["helper"] else None
+
+        # 🔥 Past-due but not yet swept → report as expired (no write here)
+        status = r["status"]
         if (
-            r["status"] == "pending"
+            status == "pending"
             and r.get("needed_at")
             and r["needed_at"] < now
         ):
-            db.requests.update_one(
-                {"_id": r["_id"]},
-                {
-                    "$set": {
-                        "status": "expired",
-                        "expired_at": now
-                    }
-                }
-            )
-            r["status"] = "expired"
-
-        is_rated = db.ratings.find_one(
-            {"request_id": r["_id"]}
-        ) is not None
-
-        helper_name = None
-        if r.get("helper_id"):
-            helper = db.helpers.find_one({"_id": r["helper_id"]})
-            helper_name = helper["name"] if helper else None
+            status = "expired"
 
         results.append({
-            "request_id": str(r["_id"]),
+            "request_id": r["_id"],
             "city": r["city"],
             "pickup_address": r.get("pickup_address"),
             "destination_address": r.get("destination_address"),
@@ -305,12 +347,15 @@ def my_requests():
             "needed_date": r.get("needed_date"),
             "needed_time": r.get("needed_time"),
 
-            "status": r["status"],
-            "is_rated": is_rated,
-            "helper_name": helper_name
+            "status": status,
+            "is_rated": len(r["rating"]) > 0,
+            "helper_name": helper["name"] if helper else None
         })
 
-    return jsonify({"requests": results}), 200
+    return jsonify({
+        "requests": results,
+        "next_cursor": next_cursor(page, limit)
+    }), 200
 
 
 
@@ -333,8 +378,8 @@ def complete_request(request_id):
     if not req:
         return jsonify({"error": "Request not found"}), 404
 
-    db.requests.update_one(
-        {"_id": req["_id"]},
+    result = db.requests.update_one(
+        {"_id": req["_id"], "status": "accepted"},
         {
             "$set": {
                 "status": "completed",
@@ -343,6 +388,12 @@ def complete_request(request_id):
         }
     )
 
+    # Lost a race (user / helper cancelled meanwhile) → nothing completed
+    if not result.modified_count:
+        return jsonify({"error": "Request is no longer active"}), 409
+
+    incr(db, active_requests=-1, completed_requests=1)
+
     db.helpers.update_one(
         {"_id": helper_id},
         {"$set": {"available": True}}
@@ -369,15 +420,10 @@ def cancel_request_user(request_id):
     if not req:
         return jsonify({"error": "Request not found or cannot be cancelled"}), 404
 
-    # If helper already accepted → make helper available again
-    if req.get("helper_id"):
-        db.helpers.update_one(
-            {"_id": req["helper_id"]},
-            {"$set": {"available": True}}
-        )
-
-    db.requests.update_one(
-        {"_id": req["_id"]},
+    # Conditional on the state we read: a helper accepting (or finishing)
+    # in between makes this miss instead of silently cancelling
+    result = db.requests.update_one(
+        {"_id": req["_id"], "status": req["status"], "helper_id": req.get("helper_id")},
         {
             "$set": {
                 "status": "cancelled",
@@ -387,6 +433,21 @@ def cancel_request_user(request_id):
         }
     )
 
+    if not result.modified_count:
+        return jsonify({"error": "Request changed, please refresh"}), 409
+
+    # If helper already accepted → make helper available again
+    if req.get("helper_id"):
+        db.helpers.update_one(
+            {"_id": req["helper_id"]},
+            {"$set": {"available": True}}
+        )
+
+    if req["status"] == "accepted":
+        incr(db, active_requests=-1)
+    else:
+        notify_request_cancelled(req["city"], req["_id"])
+
     return jsonify({"message": "Request cancelled by user"}), 200
 
 # =========================================================
@@ -411,16 +472,10 @@ def cancel_request_helper(request_id):
     if not req:
         return jsonify({"error": "Request not found or cannot be cancelled"}), 404
 
-    # Make helper available again
-    db.helpers.update_one(
-        {"_id": helper_id},
-        {"$set": {"available": True}}
-    )
-
     # ❌ DO NOT reopen request
     # ✅ Permanently cancel it
-    db.requests.update_one(
-        {"_id": req["_id"]},
+    result = db.requests.update_one(
+        {"_id": req["_id"], "status": "accepted"},
         {
             "$set": {
                 "status": "cancelled",
@@ -430,6 +485,17 @@ def cancel_request_helper(request_id):
         }
     )
 
+    if not result.modified_count:
+        return jsonify({"error": "Request is no longer active"}), 409
+
+    incr(db, active_requests=-1)
+
+    # Make helper available again
+    db.helpers.update_one(
+        {"_id": helper_id},
+        {"$set": {"available": True}}
+    )
+
     return jsonify({"message": "Request cancelled by helper"}), 200
 
 # =========================================================
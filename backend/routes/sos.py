@@ -1,4 +1,5 @@
 from routes.auth import jwt_required, get_db
+from routes.live import notify_sos_created
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 
@@ -22,4 +23,7 @@ def create_sos():
     db = get_db()
     db.sos_alerts.insert_one(sos_doc)
 
+    # 🚨 Push to connected admins right away
+    notify_sos_created(sos_doc)
+
     return jsonify({"message": "SOS alert sent successfully"}), 201
@@ -1,20 +1,92 @@
+import os
+import time
+
 from flask import request
 from flask_socketio import SocketIO, join_room, leave_room, emit
-from routes.auth import decode_jwt
+from routes.auth import decode_jwt, get_db
+from utils.presence import HEARTBEAT_SECONDS, create_presence_store
+from utils.voice_rooms import (
+    get_rooms, invalidate_rooms, list_rooms, listen_for_invalidations, shard_names
+)
 
 socketio = SocketIO(cors_allowed_origins="*", async_mode="eventlet")
 
-ALLOWED_ROOMS = ["movies", "music", "sports", "general"]
+# room -> {sid: {"name": str, "role": str}}, shared by all workers
+presence = create_presence_store()
+
+# "speaking" fan-out tuning
+SPEAKING_COALESCE_SECONDS = float(os.getenv("VOICE_SPEAKING_COALESCE_MS", 300)) / 1000
+SPEAKING_MAX_EVENTS_PER_SECOND = int(os.getenv("VOICE_SPEAKING_MAX_EVENTS_PER_SECOND", 10))
+
+# sid -> speaking state; a sid's events always land on the worker that
+# owns its connection, so this stays process-local
+speaking_state = {}
+
+
+_heartbeat = {"started": False}
+
 
-# room -> {sid: {"name": str, "role": str}}
-room_users = {}
+def _presence_heartbeat():
+    # Keeps this worker's sids alive and clears ghosts left by dead workers
+    while True:
+        try:
+            presence.heartbeat()
+            for room, sid, info, version in presence.purge_dead_workers():
+                socketio.emit("member_removed", {
+                    "room": room,
+                    "sid": sid,
+                    "version": version
+                }, to=room)
+                print(f"Purged stale member {info['name']} ({sid}) from {room}")
+        except Exception as e:
+            print("⚠️ Presence heartbeat failed:", e)
+        socketio.sleep(HEARTBEAT_SECONDS)
+
+
+def _room_invalidation_listener():
+    # Resubscribe after Redis hiccups; the cache TTL covers the gap
+    while True:
+        try:
+            listen_for_invalidations(presence.redis)
+        except Exception as e:
+            print("⚠️ Voice room invalidation listener failed:", e)
+        socketio.sleep(HEARTBEAT_SECONDS)
+
+
+def start_presence_heartbeat():
+    """Start the heartbeat loop once per process (first run purges at startup)."""
+    if _heartbeat["started"]:
+        return
+    _heartbeat["started"] = True
+    socketio.start_background_task(_presence_heartbeat)
+    if hasattr(presence, "redis"):
+        socketio.start_background_task(_room_invalidation_listener)
+
+
+def invalidate_voice_rooms():
+    """Room config changed: clear the cache in this and every other worker."""
+    invalidate_rooms(getattr(presence, "redis", None))
+
+
+def _user_list(members):
+    return [
+        {"sid": s, "name": info["name"], "role": info["role"]}
+        for s, info in members.items()
+    ]
+
+@socketio.on("connect")
+def handle_connect(auth=None):
+    # servers not started via app.py still get the heartbeat
+    start_presence_heartbeat()
 
 @socketio.on("join_room")
 def handle_join(data):
     token = data.get("token")
     room = data.get("room")
 
-    if not token or room not in ALLOWED_ROOMS:
+    config = get_rooms(get_db()).get(room)
+
+    if not token or not config:
         emit("error", {"msg": "Invalid request"})
         return
 
@@ -28,58 +100,138 @@ def handle_join(data):
         return
 
     sid = request.sid
-    join_room(room)
+    info = {"name": name, "role": role}
 
-    if room not in room_users:
-        room_users[room] = {}
+    # First shard with a free seat (capacity checked atomically)
+    capacity = config.get("max_participants") or 0
+    for shard in shard_names(room):
+        members, version = presence.join(shard, sid, info, capacity)
+        if members is not None:
+            break
+    else:
+        emit("error", {"msg": "Room is full"})
+        return
 
-    was_first = len(room_users[room]) == 0
-    room_users[room][sid] = {"name": name, "role": role}
+    join_room(shard)
 
-    user_list = [
-        {"sid": s, "name": info["name"], "role": info["role"]}
-        for s, info in room_users[room].items()
-    ]
-    emit("room_users", {"users": user_list}, room=room)
+    # Joiner gets the full list once; everyone else only the delta
+    emit("room_users", {
+        "room": shard,
+        "base_room": room,
+        "users": _user_list(members),
+        "version": version
+    }, to=sid)
+    emit("member_added", {
+        "room": shard,
+        "member": {"sid": sid, **info},
+        "version": version
+    }, room=shard, include_self=False)
 
-    if not was_first:
-        emit("user_joined", {"sid": sid}, room=room, include_self=False)
+    print(f"User {name} ({sid}) joined {shard}. Total: {len(members)}")
 
-    for existing_sid in room_users[room]:
-        if existing_sid != sid:
-            emit("user_joined", {"sid": existing_sid}, to=sid)
+@socketio.on("list_rooms")
+def handle_list_rooms(data=None):
+    # Cheap: cached room config + one occupancy read from presence
+    emit("rooms", {"rooms": list_rooms(get_db(), presence)})
 
-    print(f"User {name} ({sid}) joined {room}. Total: {len(user_list)}")
+def _remove_member(room, sid):
+    info, version = presence.leave(room, sid)
+    if info:
+        emit("member_removed", {
+            "room": room,
+            "sid": sid,
+            "version": version
+        }, room=room)
+    return info
 
 @socketio.on("leave_room")
 def handle_leave(data):
     room = data.get("room")
     sid = request.sid
 
-    if room in room_users and sid in room_users[room]:
-        name = room_users[room][sid]["name"]
-        del room_users[room][sid]
+    info = _remove_member(room, sid)
+    if info:
+        print(f"User {info['name']} ({sid}) left {room}")
+
+    speaking_state.pop(sid, None)
 
-        emit("user_left", {"sid": sid}, room=room)
+    leave_room(room)
 
-        user_list = [
-            {"sid": s, "name": info["name"], "role": info["role"]}
-            for s, info in room_users[room].items()
-        ]
-        emit("room_users", {"users": user_list}, room=room)
+@socketio.on("resync_room")
+def handle_resync(data):
+    # Client saw a version gap → send the authoritative list to it only
+    room = data.get("room")
+    if room not in presence.rooms_of(request.sid):
+        return
 
-        if not room_users[room]:
-            del room_users[room]
+    members, version = presence.snapshot(room)
+    emit("room_users", {
+        "room": room,
+        "users": _user_list(members),
+        "version": version
+    })
 
-        print(f"User {name} ({sid}) left {room}. Remaining: {len(user_list)}")
+def _broadcast_speaking(sid, state):
+    state["sent"] = state["pending"]
+    state["last_emit"] = time.monotonic()
+    socketio.emit(
+        "speaking",
+        {"sid": sid, "isSpeaking": state["sent"]},
+        to=state["room"],
+        skip_sid=sid
+    )
+
+
+def _flush_speaking(sid, delay):
+    socketio.sleep(delay)
+    state = speaking_state.get(sid)
+    if not state:
+        return
+    state["flush_scheduled"] = False
+    if state["pending"] != state["sent"]:
+        _broadcast_speaking(sid, state)
 
-    leave_room(room)
 
 @socketio.on("speaking")
 def handle_speaking(data):
+    sid = request.sid
     room = data.get("room")
-    is_speaking = data.get("isSpeaking", False)
-    emit("speaking", {"sid": request.sid, "isSpeaking": is_speaking}, room=room, include_self=False)
+    is_speaking = bool(data.get("isSpeaking", False))
+    now = time.monotonic()
+
+    state = speaking_state.get(sid)
+    if state is None or state["room"] != room:
+        state = speaking_state[sid] = {
+            "room": room,
+            "sent": False,
+            "pending": False,
+            "last_emit": 0.0,
+            "flush_scheduled": False,
+            "window_start": now,
+            "events": 0
+        }
+
+    # Per-sid cap on incoming events (drops client tick floods)
+    if now - state["window_start"] >= 1:
+        state["window_start"] = now
+        state["events"] = 0
+    state["events"] += 1
+    if state["events"] > SPEAKING_MAX_EVENTS_PER_SECOND:
+        return
+
+    state["pending"] = is_speaking
+
+    # Unchanged state → nothing to tell the room
+    if is_speaking == state["sent"] or state["flush_scheduled"]:
+        return
+
+    # Coalesce: at most one broadcast per window, last state wins
+    wait = state["last_emit"] + SPEAKING_COALESCE_SECONDS - now
+    if wait <= 0:
+        _broadcast_speaking(sid, state)
+    else:
+        state["flush_scheduled"] = True
+        socketio.start_background_task(_flush_speaking, sid, wait)
 
 @socketio.on("offer")
 def handle_offer(data):
@@ -102,21 +254,13 @@ def handle_ice(data):
 @socketio.on("disconnect")
 def handle_disconnect():
     sid = request.sid
-    for room in list(room_users.keys()):
-        if sid in room_users[room]:
-            name = room_users[room][sid]["name"]
-            del room_users[room][sid]
-
-            emit("user_left", {"sid": sid}, room=room)
-
-            user_list = [
-                {"sid": s, "name": info["name"], "role": info["role"]}
-                for s, info in room_users[room].items()
-            ]
-            emit("room_users", {"users": user_list}, room=room)
-
-            if not room_users[room]:
-                del room_users[room]
-
-            print(f"Disconnect: {name} ({sid}) from {room}")
+    speaking_state.pop(sid, None)
 
+    # Reverse index → only the rooms this sid was in
+    for room, info, version in presence.leave_all(sid):
+        emit("member_removed", {
+            "room": room,
+            "sid": sid,
+            "version": version
+        }, room=room)
+        print(f"Disconnect: {info['name']} ({sid}) from {room}")
@@ -0,0 +1,65 @@
+from pymongo.errors import DuplicateKeyError
+
+# accounts_by_email: {_id: email, role, collection, account_id}
+# _id is the email, so uniqueness is enforced by the primary key.
+# `role` is informational (role at signup); logins read the account.
+
+
+def reserve_email(db, email, role, collection, account_id):
+    """Claim `email` for a new account. Returns False if it is taken."""
+    try:
+        db.accounts_by_email.insert_one({
+            "_id": email,
+            "role": role,
+            "collection": collection,
+            "account_id": account_id
+        })
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+def release_email(db, email):
+    db.accounts_by_email.delete_one({"_id": email})
+
+
+def _account_role(account, collection):
+    if collection == "helpers":
+        return account.get("role") or "helper"
+    return account["role"]  # ❗ NO DEFAULT for users (user / admin)
+
+
+def resolve_account(db, email):
+    """Return (account, role) for `email`, or (None, None)."""
+    entry = db.accounts_by_email.find_one({"_id": email})
+
+    if entry:
+        # index only locates the account; role is read fresh so
+        # promotions / demotions apply on the next login
+        account = db[entry["collection"]].find_one({"_id": entry["account_id"]})
+        if not account:
+            return None, None
+        return account, _account_role(account, entry["collection"])
+
+    # Accounts created before the index existed (e.g. seeded admins)
+    for collection in ("users", "helpers"):
+        account = db[collection].find_one({"email": email})
+        if account:
+            role = _account_role(account, collection)
+            reserve_email(db, email, role, collection, account["_id"])
+            return account, role
+
+    return None, None
+
+
+def backfill_account_index(db):
+    """Index every existing user/helper email. Safe to run repeatedly."""
+    added = 0
+    for collection in ("users", "helpers"):
+        for account in db[collection].find({}, {"email": 1, "role": 1}):
+            if collection == "users" and not account.get("role"):
+                continue  # left unindexed: login fails as it always did
+            role = _account_role(account, collection)
+            if reserve_email(db, account["email"], role, collection, account["_id"]):
+                added += 1
+    return added
@@ -0,0 +1,56 @@
+import gzip
+import time
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {"application/json"}
+
+
+def _compress(data, encoding, config):
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BR_QUALITY"])
+    return gzip.compress(data, compresslevel=config["COMPRESS_GZIP_LEVEL"])
+
+
+def init_app(app):
+    @app.after_request
+    def _compress_json(response):
+        if (
+            response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or not 200 <= response.status_code < 300
+        ):
+            return response
+
+        data = response.get_data()
+        if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+            return response
+
+        accepted = request.accept_encodings
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            return response
+
+        started = time.perf_counter()
+        compressed = _compress(data, encoding, app.config)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.headers.add(
+            "Server-Timing",
+            f'compress;dur={elapsed_ms:.2f};desc="{encoding} {len(data)}->{len(compressed)}"'
+        )
+
+        return response
@@ -0,0 +1,85 @@
+COUNTERS_ID = "platform"
+
+COUNTER_FIELDS = [
+    "total_users",
+    "total_helpers",
+    "verified_helpers",
+    "pending_helpers",
+    "total_requests",
+    "completed_requests",
+    "active_requests",
+]
+
+
+def incr(db, **deltas):
+    """Apply counter deltas for a state transition, e.g. incr(db, total_users=1)."""
+    result = db.counters.update_one(
+        {"_id": COUNTERS_ID},
+        {"$inc": deltas}
+    )
+
+    # No upsert: a fresh $inc would create a document holding only this
+    # delta. Seed from source instead (already includes this transition).
+    if result.matched_count == 0:
+        reconcile_counters(db)
+
+
+def ensure_counters(db):
+    """Seed the counters document at startup if missing or incomplete."""
+    doc = db.counters.find_one({"_id": COUNTERS_ID})
+    if doc is None or any(field not in doc for field in COUNTER_FIELDS):
+        doc = reconcile_counters(db)["counters"]
+    return doc
+
+
+def read_counters(db):
+    doc = ensure_counters(db)
+    return {field: doc.get(field, 0) for field in COUNTER_FIELDS}
+
+
+def compute_counters(db):
+    """Exact counters rebuilt from the source collections."""
+    helpers_by_verified = {
+        row["_id"]: row["count"]
+        for row in db.helpers.aggregate([
+            {"$group": {"_id": "$verified", "count": {"$sum": 1}}}
+        ])
+    }
+
+    requests_by_status = {
+        row["_id"]: row["count"]
+        for row in db.requests.aggregate([
+            {"$match": {"status": {"$in": ["completed", "accepted"]}}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ])
+    }
+
+    return {
+        "total_users": db.users.count_documents({}),
+        "total_helpers": sum(helpers_by_verified.values()),
+        "verified_helpers": helpers_by_verified.get(True, 0),
+        "pending_helpers": helpers_by_verified.get(False, 0),
+        "total_requests": db.requests.count_documents({}),
+        "completed_requests": requests_by_status.get("completed", 0),
+        "active_requests": requests_by_status.get("accepted", 0),
+    }
+
+
+def reconcile_counters(db):
+    """Rebuild counters from source and report drift (stored - actual)."""
+    stored = db.counters.find_one({"_id": COUNTERS_ID}) or {}
+    actual = compute_counters(db)
+
+    drift = {
+        field: stored.get(field, 0) - actual[field]
+        for field in COUNTER_FIELDS
+        if stored.get(field, 0) != actual[field]
+    }
+
+    db.counters.update_one(
+        {"_id": COUNTERS_ID},
+        {"$set": actual},
+        upsert=True
+    )
+
+    return {"counters": actual, "drift": drift}
@@ -0,0 +1,16 @@
+from celery_app import celery_app
+from utils.counters import reconcile_counters
+from app import app, mongo  # 🔥 import Flask app
+
+
+@celery_app.task(name="counters.reconcile")
+def reconcile_counters_task():
+    # 🔥 PUSH FLASK APP CONTEXT
+    with app.app_context():
+        result = reconcile_counters(mongo.db)
+
+    if result["drift"]:
+        print("⚠️ Counter drift corrected:", result["drift"])
+    else:
+        print("✅ Counters in sync")
+    return result
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+
+def expire_due_requests(db, batch_size=500, max_batches=20, now=None,
+                        on_batch=None):
+    """Mark pending requests whose needed_at has passed as expired.
+
+    Works in bounded batches so a large backlog never turns into one
+    long-running write. `on_batch` is called with the ({_id, city})
+    documents of each expired batch. Returns per-sweep metrics.
+    """
+    now = now or datetime.utcnow()
+    started = datetime.utcnow()
+
+    expired = 0
+    batches = 0
+
+    while batches < max_batches:
+        due = list(
+            db.requests.find(
+                {"status": "pending", "needed_at": {"$lt": now}},
+                {"_id": 1, "city": 1}
+            ).limit(batch_size)
+        )
+        ids = [r["_id"] for r in due]
+
+        if not ids:
+            break
+
+        result = db.requests.update_many(
+            # status re-checked so a concurrent accept/cancel wins
+            {"_id": {"$in": ids}, "status": "pending"},
+            {
+                "$set": {
+                    "status": "expired",
+                    "expired_at": now
+                }
+            }
+        )
+
+        expired += result.modified_count
+        batches += 1
+
+        if on_batch:
+            on_batch(due)
+
+        if len(ids) < batch_size:
+            break
+
+    return {
+        "expired": expired,
+        "batches": batches,
+        "backlog_remaining": batches == max_batches,
+        "duration_ms": round(
+            (datetime.utcnow() - started).total_seconds() * 1000, 2
+        ),
+        "swept_at": now.isoformat()
+    }
@@ -0,0 +1,24 @@
+import os
+
+from celery_app import celery_app
+from utils.expiry import expire_due_requests
+from app import app, mongo  # 🔥 import Flask app
+from routes.live import notify_requests_expired
+
+
+@celery_app.task(name="requests.expire_due")
+def expire_due_requests_task():
+    # 🔥 PUSH FLASK APP CONTEXT
+    with app.app_context():
+        metrics = expire_due_requests(
+            mongo.db,
+            batch_size=int(os.getenv("EXPIRY_SWEEP_BATCH_SIZE", 500)),
+            max_batches=int(os.getenv("EXPIRY_SWEEP_MAX_BATCHES", 20)),
+            on_batch=notify_requests_expired,
+        )
+
+    print(
+        f"⏱️ Expiry sweep: {metrics['expired']} expired "
+        f"in {metrics['batches']} batch(es), {metrics['duration_ms']} ms"
+    )
+    return metrics
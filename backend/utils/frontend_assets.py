@@ -0,0 +1,103 @@
+import gzip
+import mimetypes
+import os
+import re
+
+from flask import request, send_file
+
+# Vite emits content-hashed bundles like assets/index-B2x9kQ1f.js; only
+# its assets/ output counts (public/ files such as apple-touch-icon.png
+# keep their names across builds)
+HASHED_ASSET = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8}\.[a-z0-9]+$")
+
+# Accept-Encoding token -> precompressed file suffix (preferred first)
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+COMPRESSIBLE = (".js", ".css", ".html", ".svg", ".json", ".txt", ".map")
+
+
+def build_manifest(dist_dir):
+    """Scan `dist_dir` once: relpath -> file info + precompressed variants."""
+    manifest = {}
+    if not os.path.isdir(dist_dir):
+        return manifest
+
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            if name.endswith((".br", ".gz")):
+                continue
+
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, dist_dir).replace(os.sep, "/")
+
+            manifest[rel] = {
+                "path": path,
+                "mimetype": mimetypes.guess_type(name)[0] or "application/octet-stream",
+                "immutable": bool(HASHED_ASSET.match(rel)),
+                "variants": {
+                    encoding: path + suffix
+                    for encoding, suffix in ENCODINGS
+                    if os.path.isfile(path + suffix)
+                },
+            }
+
+    return manifest
+
+
+def send_asset(asset):
+    """Send a manifest entry, picking a precompressed variant if accepted."""
+    path = asset["path"]
+    encoding = None
+
+    for candidate, _ in ENCODINGS:
+        if candidate in asset["variants"] and candidate in request.accept_encodings:
+            encoding = candidate
+            path = asset["variants"][candidate]
+            break
+
+    response = send_file(path, mimetype=asset["mimetype"], conditional=True)
+
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    if asset["variants"]:
+        response.vary.add("Accept-Encoding")
+
+    if asset["immutable"]:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        # index.html etc.: always revalidate so new deploys are picked up
+        response.cache_control.no_cache = True
+
+    return response
+
+
+def precompress(dist_dir, level=9):
+    """Write .gz (and .br when brotli is installed) next to text assets."""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    written = 0
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+
+            with open(path + ".gz", "wb") as f:
+                f.write(gzip.compress(data, compresslevel=level))
+            written += 1
+
+            if brotli:
+                with open(path + ".br", "wb") as f:
+                    f.write(brotli.compress(data, quality=11))
+                written += 1
+
+    return written
@@ -0,0 +1,205 @@
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+# =========================================================
+# Index manifest
+# collection -> [(keys, options)]
+# =========================================================
+INDEXES = {
+    "requests": [
+        # /requests/available (city feed sorted by time)
+        ([("city", ASCENDING), ("status", ASCENDING), ("needed_at", ASCENDING)],
+         {"name": "city_status_needed_at"}),
+        # /requests/my (user), active-request check on create
+        ([("user_id", ASCENDING), ("status", ASCENDING)],
+         {"name": "user_status"}),
+        # /requests/my (helper), availability toggle check
+        ([("helper_id", ASCENDING), ("status", ASCENDING)],
+         {"name": "helper_status"}),
+        # /requests/my keyset pagination (newest first)
+        ([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+         {"name": "user_created_at"}),
+        ([("helper_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+         {"name": "helper_created_at"}),
+        # expiry sweeper, admin stats by status
+        ([("status", ASCENDING), ("needed_at", ASCENDING)],
+         {"name": "status_needed_at"}),
+    ],
+    "ratings": [
+        # one rating per request (aggregates are incremental, not recomputed)
+        ([("request_id", ASCENDING)], {"name": "request_id_unique", "unique": True}),
+        # /ratings/my keyset pagination
+        ([("helper_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+         {"name": "helper_created_at"}),
+    ],
+    "users": [
+        ([("email", ASCENDING)], {"name": "email"}),
+    ],
+    "helpers": [
+        ([("email", ASCENDING)], {"name": "email"}),
+        # /admin/helpers/pending, admin stats
+        ([("verified", ASCENDING)], {"name": "verified"}),
+    ],
+    "profiles": [
+        ([("user_id", ASCENDING)], {"name": "user_id"}),
+    ],
+    "sos_alerts": [
+        # /admin/sos keyset pagination, with and without status filter
+        ([("created_at", DESCENDING), ("_id", DESCENDING)],
+         {"name": "created_at_id_desc"}),
+        ([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+         {"name": "status_created_at"}),
+    ],
+}
+
+# new index name -> older index on the same keys it replaces. MongoDB
+# won't hold both, so the old one is dropped only once the new one can
+# build, and restored if the build fails anyway.
+SUPERSEDED_INDEXES = {
+    ("ratings", "request_id_unique"): "request_id",
+}
+
+
+def find_duplicates(db, collection, keys, limit=5):
+    """Key values held by more than one document (blocks a unique index)."""
+    group_id = {field.replace(".", "_"): f"${field}" for field, _ in keys}
+    return list(db[collection].aggregate([
+        {"$group": {"_id": group_id, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": limit}
+    ], allowDiskUse=True))
+
+
+def _ensure_index(db, collection, keys, options):
+    name = options["name"]
+    old_name = SUPERSEDED_INDEXES.get((collection, name))
+
+    existing = db[collection].index_information()
+    if name in existing:
+        return db[collection].create_index(keys, **options)  # no-op
+
+    if options.get("unique"):
+        duplicates = find_duplicates(db, collection, keys)
+        if duplicates:
+            sample = ", ".join(str(d["_id"]) for d in duplicates)
+            raise ValueError(
+                f"duplicate keys block unique index (e.g. {sample}); "
+                "remove them and re-run"
+            )
+
+    if old_name not in existing:
+        return db[collection].create_index(keys, **options)
+
+    db[collection].drop_index(old_name)
+    try:
+        return db[collection].create_index(keys, **options)
+    except Exception:
+        db[collection].create_index(existing[old_name]["key"], name=old_name)
+        raise
+
+
+def ensure_indexes(db):
+    """
+    Create every index in the manifest. Safe to run repeatedly.
+
+    Returns (created, failures): one failing index (e.g. a unique index
+    over existing duplicates) does not stop the rest of the manifest.
+    """
+    created = {}
+    failures = {}
+    for collection, specs in INDEXES.items():
+        created[collection] = []
+        for keys, options in specs:
+            try:
+                created[collection].append(_ensure_index(db, collection, keys, options))
+            except Exception as e:
+                failures[f"{collection}.{options['name']}"] = str(e)
+    return created, failures
+
+
+# =========================================================
+# Hot queries (mirrors the filters used in routes/*)
+# name -> (collection, filter, sort)
+# =========================================================
+def hot_queries():
+    oid = ObjectId()
+    now = datetime.utcnow()
+
+    return {
+        "requests.available": (
+            "requests",
+            {"city": "Chennai", "status": "pending", "needed_at": {"$gte": now}},
+            {"needed_at": 1},
+        ),
+        "requests.my.user": (
+            "requests", {"user_id": oid}, {"created_at": -1, "_id": -1}
+        ),
+        "requests.my.helper": (
+            "requests", {"helper_id": oid}, {"created_at": -1, "_id": -1}
+        ),
+        "requests.active_for_user": (
+            "requests",
+            {"user_id": oid, "status": {"$in": ["pending", "accepted"]}},
+            None,
+        ),
+        "requests.active_for_helper": (
+            "requests",
+            {"helper_id": oid, "status": "accepted"},
+            None,
+        ),
+        "requests.expiry_sweep": (
+            "requests",
+            {"status": "pending", "needed_at": {"$lt": now}},
+            None,
+        ),
+        "ratings.by_request": ("ratings", {"request_id": oid}, None),
+        "ratings.by_helper": (
+            "ratings", {"helper_id": oid}, {"created_at": -1, "_id": -1}
+        ),
+        "users.login": ("users", {"email": "someone@example.com"}, None),
+        "helpers.login": ("helpers", {"email": "someone@example.com"}, None),
+        "helpers.pending": ("helpers", {"verified": False}, None),
+        "profiles.by_user": ("profiles", {"user_id": oid}, None),
+        "sos_alerts.latest": (
+            "sos_alerts", {}, {"created_at": -1, "_id": -1}
+        ),
+        "sos_alerts.active": (
+            "sos_alerts", {"status": "active"}, {"created_at": -1, "_id": -1}
+        ),
+    }
+
+
+def _plan_stages(plan):
+    """Yield every stage name in a (possibly nested) query plan."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def check_indexes(db):
+    """Explain each hot query; return {name: [stages]} for any COLLSCAN."""
+    failures = {}
+
+    for name, (collection, query, sort) in hot_queries().items():
+        command = {"find": collection, "filter": query}
+        if sort:
+            command["sort"] = sort
+
+        explain = db.command(
+            "explain", command, verbosity="queryPlanner"
+        )
+        stages = list(
+            _plan_stages(explain["queryPlanner"]["winningPlan"])
+        )
+
+        if "COLLSCAN" in stages:
+            failures[name] = stages
+
+    return failures
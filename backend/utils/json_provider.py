@@ -0,0 +1,71 @@
+import json
+from datetime import date, datetime, timezone
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+def _default(obj):
+    """BSON / datetime types not handled natively by the encoder."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)  # Mongo datetimes are UTC
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """jsonify() that understands ObjectId / datetime, using orjson when present."""
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        option = self._orjson_option(kwargs)
+        if option is not None:
+            return orjson.dumps(obj, default=_default, option=option).decode()
+
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def _orjson_option(self, kwargs):
+        """
+        orjson flags equivalent to the json.dumps kwargs, or None when
+        they need the stdlib encoder. response() always passes either
+        compact separators or indent=2, so jsonify() lands here.
+        """
+        if orjson is None:
+            return None
+
+        kwargs = dict(kwargs)
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+        if kwargs.pop("separators", (",", ":")) != (",", ":"):
+            return None
+        indent = kwargs.pop("indent", None)
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        elif indent is not None:
+            return None
+        if kwargs.pop("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+
+        return None if kwargs else option
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from flask import g, has_request_context, request
+from pymongo import monitoring
+
+
+class QueryMetricsListener(monitoring.CommandListener):
+    """Counts Mongo commands and their latency for the current Flask request."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        if not has_request_context():
+            return
+        g.mongo_queries = g.get("mongo_queries", 0) + 1
+        g.mongo_time_ms = g.get("mongo_time_ms", 0.0) + event.duration_micros / 1000
+
+
+# endpoint -> {"requests", "queries", "mongo_ms", "total_ms"}
+_endpoint_stats = {}
+_endpoint_stats_lock = threading.Lock()
+
+
+def endpoint_stats():
+    with _endpoint_stats_lock:
+        stats = {}
+        for endpoint, s in _endpoint_stats.items():
+            n = s["requests"]
+            stats[endpoint] = {
+                **s,
+                "avg_queries": round(s["queries"] / n, 2),
+                "avg_mongo_ms": round(s["mongo_ms"] / n, 2),
+                "avg_total_ms": round(s["total_ms"] / n, 2),
+            }
+        return stats
+
+
+def init_app(app):
+    @app.before_request
+    def _start_query_metrics():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _finish_query_metrics(response):
+        queries = g.get("mongo_queries", 0)
+        mongo_ms = g.get("mongo_time_ms", 0.0)
+        total_ms = (time.perf_counter() - g.get("request_started", time.perf_counter())) * 1000
+
+        response.headers["X-Mongo-Queries"] = str(queries)
+        response.headers.add(
+            "Server-Timing", f"mongo;dur={mongo_ms:.2f}, total;dur={total_ms:.2f}"
+        )
+
+        endpoint = request.endpoint or "unknown"
+        with _endpoint_stats_lock:
+            s = _endpoint_stats.setdefault(
+                endpoint,
+                {"requests": 0, "queries": 0, "mongo_ms": 0.0, "total_ms": 0.0}
+            )
+            s["requests"] += 1
+            s["queries"] += queries
+            s["mongo_ms"] += mongo_ms
+            s["total_ms"] += total_ms
+
+        return response
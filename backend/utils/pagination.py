@@ -0,0 +1,74 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+
+# newest first; _id breaks ties between equal timestamps
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_limit(value, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    try:
+        limit = int(value) if value is not None else default
+    except ValueError:
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def encode_cursor(doc, phase=None):
+    """Opaque cursor pointing just after `doc` in KEYSET_SORT order.
+
+    `phase` names the segment of a multi-segment listing (e.g. active
+    SOS alerts before resolved ones) the cursor points into.
+    """
+    payload = {
+        "t": doc["created_at"].isoformat(),
+        "id": str(doc["_id"])
+    }
+    if phase is not None:
+        payload["p"] = phase
+    raw = json.dumps(payload)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(created_at, _id, phase) for an encoded cursor."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(raw["t"]), ObjectId(raw["id"]), raw.get("p")
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def cursor_phase(cursor):
+    return decode_cursor(cursor)[2] if cursor else None
+
+
+def keyset_filter(cursor):
+    """Mongo filter selecting documents after `cursor` (empty if None)."""
+    if not cursor:
+        return {}
+
+    created_at, last_id, _ = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": last_id}}
+        ]
+    }
+
+
+def next_cursor(page, limit, phase=None):
+    """Cursor for the following page, or None when this is the last one."""
+    if len(page) < limit:
+        return None
+    return encode_cursor(page[-1], phase)
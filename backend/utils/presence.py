@@ -0,0 +1,313 @@
+import json
+import os
+import threading
+import uuid
+
+# =========================================================
+# Voice-room presence
+# room -> {sid: {"name", "role"}} plus a sid -> {rooms} reverse index
+# and a per-room version bumped on every membership change.
+# RedisPresenceStore shares it across Socket.IO workers;
+# MemoryPresenceStore is the single-process fallback.
+# =========================================================
+
+# A worker whose heartbeat key outlives this is considered dead and
+# its sids are purged by any live worker (no disconnect ever arrives)
+WORKER_TTL_SECONDS = int(os.getenv("VOICE_PRESENCE_WORKER_TTL_SECONDS", 30))
+HEARTBEAT_SECONDS = WORKER_TTL_SECONDS / 3
+
+
+class MemoryPresenceStore:
+    def __init__(self):
+        self._rooms = {}
+        self._sid_rooms = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def join(self, room, sid, info, capacity=0):
+        """Add `sid` to `room`; returns (members, version).
+
+        With `capacity` > 0 a full room is left untouched and
+        (None, None) is returned.
+        """
+        with self._lock:
+            members = self._rooms.get(room, {})
+            if capacity and sid not in members and len(members) >= capacity:
+                return None, None
+
+            self._rooms.setdefault(room, {})[sid] = info
+            self._sid_rooms.setdefault(sid, set()).add(room)
+            self._versions[room] = self._versions.get(room, 0) + 1
+            return dict(self._rooms[room]), self._versions[room]
+
+    def leave(self, room, sid):
+        """Remove `sid` from `room`; returns (info, version), (None, None) if absent."""
+        with self._lock:
+            rooms = self._sid_rooms.get(sid)
+            if rooms is not None:
+                rooms.discard(room)
+                if not rooms:
+                    del self._sid_rooms[sid]
+
+            info = self._rooms.get(room, {}).pop(sid, None)
+            if info is None:
+                return None, None
+
+            if not self._rooms[room]:
+                del self._rooms[room]
+            self._versions[room] = self._versions.get(room, 0) + 1
+            return info, self._versions[room]
+
+    def leave_all(self, sid):
+        """Remove `sid` from every room it is in (via the reverse index).
+
+        Returns [(room, info, version)]; cost is O(rooms of sid).
+        """
+        with self._lock:
+            removed = []
+            for room in self._sid_rooms.pop(sid, ()):
+                info = self._rooms.get(room, {}).pop(sid, None)
+                if info is None:
+                    continue
+                if not self._rooms[room]:
+                    del self._rooms[room]
+                self._versions[room] = self._versions.get(room, 0) + 1
+                removed.append((room, info, self._versions[room]))
+            return removed
+
+    def snapshot(self, room):
+        """(members, version) read together."""
+        with self._lock:
+            return dict(self._rooms.get(room, {})), self._versions.get(room, 0)
+
+    def members(self, room):
+        return self.snapshot(room)[0]
+
+    def occupancy(self, rooms):
+        """{room: member count} for each of `rooms`."""
+        with self._lock:
+            return {room: len(self._rooms.get(room, ())) for room in rooms}
+
+    def rooms_of(self, sid):
+        with self._lock:
+            return set(self._sid_rooms.get(sid, ()))
+
+    def heartbeat(self):
+        pass  # state dies with the process, nothing to expire
+
+    def purge_dead_workers(self):
+        return []
+
+
+# KEYS: room hash, sid set, room version, worker sids, worker alive, workers
+# ARGV: sid, info json, room, capacity, worker id, worker ttl
+_JOIN_SCRIPT = """
+local capacity = tonumber(ARGV[4])
+if capacity > 0 and redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0
+        and redis.call('HLEN', KEYS[1]) >= capacity then
+    return {}
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[3])
+redis.call('SADD', KEYS[4], ARGV[1])
+redis.call('SET', KEYS[5], 1, 'EX', ARGV[6])
+redis.call('SADD', KEYS[6], ARGV[5])
+local version = redis.call('INCR', KEYS[3])
+return {version, redis.call('HGETALL', KEYS[1])}
+"""
+
+# KEYS: room hash, sid set, room version | ARGV: sid, room
+_LEAVE_SCRIPT = """
+redis.call('SREM', KEYS[2], ARGV[2])
+local info = redis.call('HGET', KEYS[1], ARGV[1])
+if not info then return {} end
+redis.call('HDEL', KEYS[1], ARGV[1])
+return {info, redis.call('INCR', KEYS[3])}
+"""
+
+
+# KEYS: sid set, worker sids | ARGV: sid, key prefix
+_LEAVE_ALL_SCRIPT = """
+local removed = {}
+for _, room in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local room_key = ARGV[2] .. ':room:' .. room
+    local info = redis.call('HGET', room_key, ARGV[1])
+    if info then
+        redis.call('HDEL', room_key, ARGV[1])
+        local version = redis.call('INCR', room_key .. ':version')
+        table.insert(removed, {room, info, version})
+    end
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[1])
+return removed
+"""
+
+# KEYS: worker sids, worker alive, workers | ARGV: worker id, key prefix
+# No-op while the worker's heartbeat key exists
+_PURGE_WORKER_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then return {} end
+local removed = {}
+for _, sid in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local sid_key = ARGV[2] .. ':sid:' .. sid
+    for _, room in ipairs(redis.call('SMEMBERS', sid_key)) do
+        local room_key = ARGV[2] .. ':room:' .. room
+        local info = redis.call('HGET', room_key, sid)
+        if info then
+            redis.call('HDEL', room_key, sid)
+            local version = redis.call('INCR', room_key .. ':version')
+            table.insert(removed, {room, sid, info, version})
+        end
+    end
+    redis.call('DEL', sid_key)
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[3], ARGV[1])
+return removed
+"""
+
+
+class RedisPresenceStore:
+    def __init__(self, client, prefix="voice", worker_ttl=WORKER_TTL_SECONDS):
+        self.redis = client
+        self.prefix = prefix
+        self.worker_ttl = worker_ttl
+        # sids joined through this process; purged if it stops heartbeating
+        self.worker_id = uuid.uuid4().hex
+        self._join = client.register_script(_JOIN_SCRIPT)
+        self._leave = client.register_script(_LEAVE_SCRIPT)
+        self._leave_all = client.register_script(_LEAVE_ALL_SCRIPT)
+        self._purge_worker = client.register_script(_PURGE_WORKER_SCRIPT)
+
+    def _room_key(self, room):
+        return f"{self.prefix}:room:{room}"
+
+    def _version_key(self, room):
+        return f"{self.prefix}:room:{room}:version"
+
+    def _sid_key(self, sid):
+        return f"{self.prefix}:sid:{sid}"
+
+    def _workers_key(self):
+        return f"{self.prefix}:workers"
+
+    def _worker_sids_key(self, worker_id):
+        return f"{self.prefix}:worker:{worker_id}:sids"
+
+    def _worker_alive_key(self, worker_id):
+        return f"{self.prefix}:worker:{worker_id}:alive"
+
+    def _keys(self, room, sid):
+        return [self._room_key(room), self._sid_key(sid), self._version_key(room)]
+
+    def join(self, room, sid, info, capacity=0):
+        # also (re)arms this worker's heartbeat, so a sid is never
+        # recorded under a worker that looks dead
+        result = self._join(
+            keys=self._keys(room, sid) + [
+                self._worker_sids_key(self.worker_id),
+                self._worker_alive_key(self.worker_id),
+                self._workers_key()
+            ],
+            args=[sid, json.dumps(info), room, capacity, self.worker_id, self.worker_ttl]
+        )
+        if not result:
+            return None, None  # room full
+        version, flat = result
+        members = dict(zip(flat[::2], flat[1::2]))
+        return self._decode(members), int(version)
+
+    def leave(self, room, sid):
+        result = self._leave(keys=self._keys(room, sid), args=[sid, room])
+        if not result:
+            return None, None
+        raw, version = result
+        return json.loads(raw), int(version)
+
+    def leave_all(self, sid):
+        """Remove `sid` from all its rooms in one round trip."""
+        removed = self._leave_all(
+            keys=[self._sid_key(sid), self._worker_sids_key(self.worker_id)],
+            args=[sid, self.prefix]
+        )
+        return [
+            (room.decode() if isinstance(room, bytes) else room, json.loads(info), int(version))
+            for room, info, version in removed
+        ]
+
+    def heartbeat(self):
+        """Mark this worker alive for another worker_ttl seconds."""
+        pipe = self.redis.pipeline()
+        pipe.set(self._worker_alive_key(self.worker_id), 1, ex=self.worker_ttl)
+        pipe.sadd(self._workers_key(), self.worker_id)
+        pipe.execute()
+
+    def purge_dead_workers(self):
+        """
+        Drop the sids of workers that stopped heartbeating (killed or
+        redeployed without disconnects). Returns [(room, sid, info, version)].
+        """
+        removed = []
+        for worker_id in self.redis.smembers(self._workers_key()):
+            if isinstance(worker_id, bytes):
+                worker_id = worker_id.decode()
+            if worker_id == self.worker_id:
+                continue
+            removed.extend(self._purge_worker(
+                keys=[
+                    self._worker_sids_key(worker_id),
+                    self._worker_alive_key(worker_id),
+                    self._workers_key()
+                ],
+                args=[worker_id, self.prefix]
+            ))
+
+        return [
+            (
+                room.decode() if isinstance(room, bytes) else room,
+                sid.decode() if isinstance(sid, bytes) else sid,
+                json.loads(info),
+                int(version)
+            )
+            for room, sid, info, version in removed
+        ]
+
+    def snapshot(self, room):
+        pipe = self.redis.pipeline()  # MULTI/EXEC → consistent pair
+        pipe.hgetall(self._room_key(room))
+        pipe.get(self._version_key(room))
+        members, version = pipe.execute()
+        return self._decode(members), int(version or 0)
+
+    def members(self, room):
+        return self._decode(self.redis.hgetall(self._room_key(room)))
+
+    def occupancy(self, rooms):
+        pipe = self.redis.pipeline(transaction=False)
+        for room in rooms:
+            pipe.hlen(self._room_key(room))
+        return dict(zip(rooms, pipe.execute()))
+
+    def rooms_of(self, sid):
+        return {
+            r.decode() if isinstance(r, bytes) else r
+            for r in self.redis.smembers(self._sid_key(sid))
+        }
+
+    @staticmethod
+    def _decode(members):
+        return {
+            (sid.decode() if isinstance(sid, bytes) else sid): json.loads(info)
+            for sid, info in members.items()
+        }
+
+
+def create_presence_store():
+    """Redis when VOICE_PRESENCE_REDIS_URL/REDIS_URL is set, else in-memory."""
+    url = os.getenv("VOICE_PRESENCE_REDIS_URL") or os.getenv("REDIS_URL")
+    if not url:
+        return MemoryPresenceStore()
+
+    import redis
+
+    return RedisPresenceStore(redis.Redis.from_url(url))
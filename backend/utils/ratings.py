@@ -0,0 +1,102 @@
+from pymongo import ReturnDocument
+
+AGGREGATE_FIELDS = {"rating_sum": 1, "total_reviews": 1, "rating_histogram": 1, "avg_rating": 1}
+
+
+def _aggregates_from_buckets(buckets):
+    histogram = {str(star): 0 for star in range(1, 6)}
+    rating_sum = 0
+    total = 0
+
+    for bucket in buckets:
+        histogram[str(bucket["rating"])] = bucket["count"]
+        rating_sum += bucket["rating"] * bucket["count"]
+        total += bucket["count"]
+
+    return {
+        "rating_sum": rating_sum,
+        "total_reviews": total,
+        "rating_histogram": histogram,
+        "avg_rating": round(rating_sum / total, 2) if total else None
+    }
+
+
+def _rebuild(db, match):
+    pipeline = [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {"helper_id": "$helper_id", "rating": "$rating"},
+                "count": {"$sum": 1}
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id.helper_id",
+                "buckets": {
+                    "$push": {"rating": "$_id.rating", "count": "$count"}
+                }
+            }
+        }
+    ]
+
+    rebuilt = {}
+    for row in db.ratings.aggregate(pipeline):
+        aggregates = _aggregates_from_buckets(row["buckets"])
+        db.helpers.update_one({"_id": row["_id"]}, {"$set": aggregates})
+        rebuilt[row["_id"]] = aggregates
+
+    return rebuilt
+
+
+def rebuild_rating_aggregates(db):
+    """Recompute rating_sum / total_reviews / histogram for every helper.
+
+    Repairs drift in bulk; single helpers missing the fields are
+    migrated lazily by helper_rating_aggregates().
+    """
+    return len(_rebuild(db, {}))
+
+
+def helper_rating_aggregates(db, helper_id):
+    """Aggregates for one helper, migrating helpers rated before rating_sum existed."""
+    helper = db.helpers.find_one({"_id": helper_id}, AGGREGATE_FIELDS) or {}
+    if "rating_sum" in helper or not helper.get("total_reviews"):
+        return helper
+    return _rebuild(db, {"helper_id": helper_id}).get(helper_id, helper)
+
+
+def add_rating(db, helper_id, rating_value):
+    """
+    Fold one new rating into the helper aggregates and avg_rating in a
+    single pipeline update. The rating document must already be inserted:
+    helpers without rating_sum are rebuilt from the ratings collection.
+    """
+    histogram_key = f"rating_histogram.{rating_value}"
+
+    helper = db.helpers.find_one_and_update(
+        {"_id": helper_id, "rating_sum": {"$exists": True}},
+        [
+            {
+                "$set": {
+                    "rating_sum": {"$add": ["$rating_sum", rating_value]},
+                    "total_reviews": {"$add": [{"$ifNull": ["$total_reviews", 0]}, 1]},
+                    histogram_key: {"$add": [{"$ifNull": [f"${histogram_key}", 0]}, 1]}
+                }
+            },
+            {
+                "$set": {
+                    "avg_rating": {
+                        "$round": [{"$divide": ["$rating_sum", "$total_reviews"]}, 2]
+                    }
+                }
+            }
+        ],
+        projection=AGGREGATE_FIELDS,
+        return_document=ReturnDocument.AFTER
+    )
+
+    if helper is None:
+        helper = _rebuild(db, {"helper_id": helper_id}).get(helper_id, {})
+
+    return helper
@@ -0,0 +1,44 @@
+import os
+
+from bson import ObjectId
+
+from celery_app import celery_app
+from app import app, mongo  # 🔥 import Flask app
+
+THUMBNAIL_SIZE = (320, 320)
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(OSError,),
+    retry_kwargs={"max_retries": 3, "countdown": 10},
+)
+def generate_document_thumbnail_task(self, helper_id, kind, rel_path):
+    """Render a small JPEG preview of an uploaded image for admin review."""
+    try:
+        from PIL import Image
+    except ImportError:
+        print("⚠️ Pillow not installed, skipping thumbnail")
+        return None
+
+    with app.app_context():
+        upload_root = app.config["UPLOAD_FOLDER"]
+        sha256 = os.path.splitext(os.path.basename(rel_path))[0]
+        thumb_rel = f"thumbs/{sha256[:2]}/{sha256}.jpg"
+        thumb_path = os.path.join(upload_root, thumb_rel)
+
+        if not os.path.exists(thumb_path):
+            try:
+                with Image.open(os.path.join(upload_root, rel_path)) as img:
+                    img.thumbnail(THUMBNAIL_SIZE)
+                    os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+                    img.convert("RGB").save(thumb_path, "JPEG", quality=80)
+            except Image.UnidentifiedImageError:
+                return None  # PDFs etc. have no preview
+
+        mongo.db.helpers.update_one(
+            {"_id": ObjectId(helper_id)},
+            {"$set": {f"documents.{kind}.thumbnail_path": thumb_rel}}
+        )
+
+    return thumb_rel
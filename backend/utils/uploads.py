@@ -0,0 +1,66 @@
+import hashlib
+import os
+import tempfile
+
+from werkzeug.utils import secure_filename
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def store_upload(file, upload_root, max_bytes):
+    """Stream `file` to content-addressed storage under `upload_root`.
+
+    The file is written in chunks while being hashed, aborted once it
+    exceeds `max_bytes`, and stored at blobs/<aa>/<sha256><ext>. A file
+    that is already stored is not written twice.
+    """
+    filename = secure_filename(file.filename or "") or "upload"
+    ext = os.path.splitext(filename)[1].lower()
+
+    tmp_dir = os.path.join(upload_root, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(
+                        f"{filename} exceeds {max_bytes // (1024 * 1024)} MB limit"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        rel_path = f"blobs/{sha256[:2]}/{sha256}{ext}"
+        final_path = os.path.join(upload_root, rel_path)
+
+        if os.path.exists(final_path):
+            os.remove(tmp_path)  # 🔥 duplicate content → reuse stored blob
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return {
+        "filename": filename,
+        "path": rel_path,
+        "sha256": sha256,
+        "size": size,
+        "content_type": file.mimetype
+    }
@@ -0,0 +1,128 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+# =========================================================
+# Voice room catalogue (admin-configurable, stored in voice_rooms)
+# A full room overflows into shards: music, music-2, music-3, ...
+# =========================================================
+DEFAULT_CAPACITY = int(os.getenv("VOICE_ROOM_DEFAULT_CAPACITY", 8))
+MAX_SHARDS = int(os.getenv("VOICE_ROOM_MAX_SHARDS", 10))
+CACHE_SECONDS = float(os.getenv("VOICE_ROOMS_CACHE_SECONDS", 30))
+
+# no "-" so shard names (music-2) can never clash with a real room
+ROOM_NAME = re.compile(r"^[a-z0-9_]{1,32}$")
+
+DEFAULT_ROOMS = [
+    {"_id": "movies", "description": "Discuss latest films, classics & reviews"},
+    {"_id": "music", "description": "Share songs, artists, playlists & vibes"},
+    {"_id": "sports", "description": "Live commentary, debates & match talk"},
+    {"_id": "general", "description": "Casual chat, hangout & everything else"},
+]
+
+SEEDED_MARKER = "voice_rooms_seeded"
+
+# Admin edits are published here so other workers drop their cache
+# instead of enforcing old capacities until CACHE_SECONDS runs out
+INVALIDATE_CHANNEL = "voice:rooms:invalidate"
+
+_cache = {"rooms": None, "expires_at": 0.0}
+_cache_lock = threading.Lock()
+
+
+def get_rooms(db):
+    """{name: room config} for active rooms, cached per process."""
+    with _cache_lock:
+        if _cache["rooms"] is not None and time.monotonic() < _cache["expires_at"]:
+            return _cache["rooms"]
+
+    rooms = {
+        room["_id"]: room
+        for room in db.voice_rooms.find({"active": True}).sort("_id", 1)
+    }
+
+    with _cache_lock:
+        _cache["rooms"] = rooms
+        _cache["expires_at"] = time.monotonic() + CACHE_SECONDS
+    return rooms
+
+
+def seed_default_rooms(db):
+    """
+    Seed the original four rooms once per database (called at startup).
+    The marker keeps an admin-emptied catalogue empty across restarts.
+    """
+    if db.app_state.find_one({"_id": SEEDED_MARKER}):
+        return False
+
+    # existing catalogue (pre-marker deploys) is left as the admin made it
+    if db.voice_rooms.estimated_document_count() == 0:
+        for room in DEFAULT_ROOMS:
+            db.voice_rooms.update_one(
+                {"_id": room["_id"]},
+                {"$setOnInsert": {
+                    "description": room["description"],
+                    "max_participants": DEFAULT_CAPACITY,
+                    "active": True
+                }},
+                upsert=True  # race-safe across workers starting together
+            )
+
+    try:
+        db.app_state.insert_one({"_id": SEEDED_MARKER, "at": datetime.utcnow()})
+    except DuplicateKeyError:
+        pass
+    return True
+
+
+def invalidate_rooms(redis_client=None):
+    """Drop the cached catalogue here and, given Redis, in every worker."""
+    with _cache_lock:
+        _cache["rooms"] = None
+    if redis_client is not None:
+        redis_client.publish(INVALIDATE_CHANNEL, "1")
+
+
+def listen_for_invalidations(redis_client):
+    """Blocking loop (run as a background task): clear the cache on publish."""
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(INVALIDATE_CHANNEL)
+    for _ in pubsub.listen():
+        with _cache_lock:
+            _cache["rooms"] = None
+
+
+def shard_name(base, index):
+    return base if index == 1 else f"{base}-{index}"
+
+
+def shard_names(base):
+    return [shard_name(base, i) for i in range(1, MAX_SHARDS + 1)]
+
+
+def list_rooms(db, presence):
+    """Active rooms with live occupancy, in one presence-store round trip."""
+    rooms = get_rooms(db)
+    occupancy = presence.occupancy(
+        [shard for name in rooms for shard in shard_names(name)]
+    )
+
+    listing = []
+    for name, room in rooms.items():
+        shards = [
+            {"room": shard, "occupancy": occupancy[shard]}
+            for shard in shard_names(name)
+            if occupancy[shard]
+        ]
+        listing.append({
+            "name": name,
+            "description": room.get("description"),
+            "max_participants": room.get("max_participants"),
+            "occupancy": sum(s["occupancy"] for s in shards),
+            "shards": shards
+        })
+    return listing
@@ -22,16 +22,27 @@ const AdminDashboard = () => {
   useEffect(() => {
     fetchData();
 
-    // 🚨 Real-time SOS Listener
-    voiceSocket.on("admin_sos_alert", (data) => {
-      // Add only if it's an active alert (prevent duplicates if already resolved)
-      if (data.status === "active") {
-        setSosAlerts((prev) => [data, ...prev]);
-      }
+    // 🚨 Real-time SOS push (admins room)
+    const joinAdmins = () => {
+      voiceSocket.emit("join_admins", { token: localStorage.getItem("token") });
+    };
+    joinAdmins();
+    voiceSocket.on("connect", joinAdmins);
+
+    voiceSocket.on("sos_created", (data) => {
+      setSosAlerts((prev) =>
+        prev.some((s) => s._id === data._id) ? prev : [data, ...prev]
+      );
+    });
+
+    voiceSocket.on("sos_resolved", ({ _id }) => {
+      setSosAlerts((prev) => prev.filter((s) => s._id !== _id));
     });
 
     return () => {
-      voiceSocket.off("admin_sos_alert");
+      voiceSocket.off("connect", joinAdmins);
+      voiceSocket.off("sos_created");
+      voiceSocket.off("sos_resolved");
     };
   }, []);
 
@@ -40,7 +51,7 @@ const AdminDashboard = () => {
       const [statsRes, helpersRes, sosRes] = await Promise.all([
         adminAPI.getStats(),
         adminAPI.getPendingHelpers(),
-        adminAPI.getSOS(), 
+        adminAPI.getSOS({ status: "active" }),
       ]);
 
       setStats(statsRes.data);
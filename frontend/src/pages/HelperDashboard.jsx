@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { requestsAPI, ratingsAPI, authAPI } from '../services/api';
+import { requestsAPI, ratingsAPI, authAPI, voiceSocket } from '../services/api';
 import HelperNavbar from '../components/HelperNavbar';
 import HelperSidebar from '../components/HelperSidebar'; // ← Added HelperSidebar
 import { Power, MapPin, Star, Clock } from 'lucide-react';
@@ -61,6 +61,45 @@ const HelperDashboard = () => {
     loadDashboard();
   }, []);
 
+  // =========================================================
+  // LIVE FEED (city room deltas instead of polling)
+  // =========================================================
+  useEffect(() => {
+    if (!isAvailable) return;
+
+    const joinFeed = () => {
+      voiceSocket.emit('join_helper_feed', { token: localStorage.getItem('token') });
+    };
+    joinFeed();
+    voiceSocket.on('connect', joinFeed);
+
+    const removePending = (ids) => {
+      setRequests(prev =>
+        prev.filter(r => !(r.status === 'pending' && ids.includes(r.request_id)))
+      );
+    };
+
+    voiceSocket.on('request_created', (req) => {
+      setRequests(prev =>
+        prev.some(r => r.request_id === req.request_id)
+          ? prev
+          : [...prev, { ...req, status: 'pending' }]
+      );
+    });
+    voiceSocket.on('request_taken', ({ request_id }) => removePending([request_id]));
+    voiceSocket.on('request_cancelled', ({ request_id }) => removePending([request_id]));
+    voiceSocket.on('request_expired', ({ request_ids }) => removePending(request_ids));
+
+    return () => {
+      voiceSocket.emit('leave_helper_feed');
+      voiceSocket.off('connect', joinFeed);
+      voiceSocket.off('request_created');
+      voiceSocket.off('request_taken');
+      voiceSocket.off('request_cancelled');
+      voiceSocket.off('request_expired');
+    };
+  }, [isAvailable]);
+
   // =========================================================
   // TOGGLE AVAILABILITY
   // =========================================================
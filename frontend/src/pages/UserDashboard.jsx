@@ -7,6 +7,8 @@ import { motion } from 'framer-motion';
 
 const UserDashboard = () => {
   const [requests, setRequests] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showModal, setShowModal] = useState(false);
   const [newRequest, setNewRequest] = useState({
     city: '',
@@ -32,6 +34,7 @@ const UserDashboard = () => {
     try {
       const res = await requestsAPI.getMy();
       setRequests(res.data?.requests || []);
+      setNextCursor(res.data?.next_cursor || null);
     } catch {
       setError('Failed to load requests');
     } finally {
@@ -39,6 +42,21 @@ const UserDashboard = () => {
     }
   };
 
+  // Older history, one page at a time (keyset cursor from the last page)
+  const loadMoreRequests = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await requestsAPI.getMy({ cursor: nextCursor });
+      setRequests(prev => [...prev, ...(res.data?.requests || [])]);
+      setNextCursor(res.data?.next_cursor || null);
+    } catch {
+      setError('Failed to load more requests');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // =========================================================
   // CREATE REQUEST
   // =========================================================
@@ -267,6 +285,16 @@ const UserDashboard = () => {
                   </div>
                 ))
               )}
+
+              {nextCursor && (
+                <button
+                  onClick={loadMoreRequests}
+                  disabled={loadingMore}
+                  className="w-full px-6 py-3 bg-white text-blue-600 rounded-xl shadow hover:bg-gray-50 transition disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load older requests'}
+                </button>
+              )}
             </div>
           </div>
         </motion.div>
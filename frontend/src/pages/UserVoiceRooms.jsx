@@ -6,7 +6,7 @@ import Navbar from "../components/Navbar";
 import SideBar from "../components/SideBar";
 import { motion } from "framer-motion";
 
-const rooms = ["movies", "music", "sports", "general"];
+const defaultRooms = ["movies", "music", "sports", "general"];
 
 const roomDescriptions = {
   movies: "Discuss latest films, classics & reviews",
@@ -25,14 +25,18 @@ const roomGradients = {
 export default function UserVoiceRooms() {
   const { user, role } = useAuth();
 
-  const currentRoom = useRef(null);
+  const currentRoom = useRef(null); // shard actually joined, e.g. "music-2"
+  const currentBaseRoom = useRef(null); // room picked in the UI, e.g. "music"
   const localStream = useRef(null);
   const peers = useRef({});
   const remoteAudios = useRef({});
   const audioCtxRef = useRef(null);
   const speakingInterval = useRef(null);
+  const roomVersion = useRef(0);
 
   const [activeRoom, setActiveRoom] = useState(null);
+  const [rooms, setRooms] = useState(defaultRooms);
+  const [descriptions, setDescriptions] = useState(roomDescriptions);
   const [roomUsers, setRoomUsers] = useState([]);
   const [speakingUsers, setSpeakingUsers] = useState({});
   const [isMuted, setIsMuted] = useState(true);
@@ -67,6 +71,42 @@ export default function UserVoiceRooms() {
     return () => voiceSocket.off("connect", handleConnect);
   }, []);
 
+  // ============================
+  // ROOM CATALOGUE + OCCUPANCY
+  // ============================
+  useEffect(() => {
+    const requestRooms = () => voiceSocket.emit("list_rooms");
+
+    const handleRooms = ({ rooms: list }) => {
+      setRooms(list.map((r) => r.name));
+      setDescriptions((prev) => ({
+        ...prev,
+        ...Object.fromEntries(list.map((r) => [r.name, r.description])),
+      }));
+      setRoomCounts(Object.fromEntries(list.map((r) => [r.name, r.occupancy])));
+    };
+
+    const handleError = ({ msg }) => {
+      if (msg === "Room is full") {
+        addNotification("All seats in this room are taken. Try again soon.", "warning");
+        leaveRoom();
+      }
+    };
+
+    requestRooms();
+    const refresh = setInterval(requestRooms, 15000);
+    voiceSocket.on("connect", requestRooms);
+    voiceSocket.on("rooms", handleRooms);
+    voiceSocket.on("error", handleError);
+
+    return () => {
+      clearInterval(refresh);
+      voiceSocket.off("connect", requestRooms);
+      voiceSocket.off("rooms", handleRooms);
+      voiceSocket.off("error", handleError);
+    };
+  }, []);
+
   // ============================
   // JOIN ROOM
   // ============================
@@ -75,7 +115,7 @@ export default function UserVoiceRooms() {
       addNotification("You must be logged in to join a room", "warning");
       return;
     }
-    if (currentRoom.current === room) return;
+    if (currentBaseRoom.current === room) return;
     if (currentRoom.current) {
       addNotification("Leaving current room first...", "info");
       leaveRoom();
@@ -91,6 +131,7 @@ export default function UserVoiceRooms() {
       }
 
       currentRoom.current = room;
+      currentBaseRoom.current = room;
       setActiveRoom(room);
 
       voiceSocket.emit("join_room", {
@@ -112,6 +153,7 @@ export default function UserVoiceRooms() {
       console.error("Failed to join room:", err);
       addNotification("Failed to join room. Try again.", "warning");
       currentRoom.current = null;
+      currentBaseRoom.current = null;
       setActiveRoom(null);
     }
   };
@@ -149,11 +191,13 @@ export default function UserVoiceRooms() {
     }
 
     currentRoom.current = null;
+    currentBaseRoom.current = null;
     setActiveRoom(null);
     setRoomUsers([]);
     setIsMuted(true);
 
     leaveVoiceRoom({ room: roomToLeave });
+    voiceSocket.emit("list_rooms");
   };
 
   // ============================
@@ -178,7 +222,7 @@ export default function UserVoiceRooms() {
       const volume = data.reduce((a, b) => a + b, 0) / data.length;
 
       voiceSocket.emit("speaking", {
-        room,
+        room: currentRoom.current,
         isSpeaking: volume > 25,
       });
     }, 300);
@@ -228,15 +272,25 @@ export default function UserVoiceRooms() {
   // SOCKET LISTENERS — POLITE SIGNALING (No race conditions)
   // ============================
   useEffect(() => {
-    const handleRoomUsers = ({ users }) => {
-      setRoomUsers(users || []);
-      if (activeRoom) {
-        setRoomCounts((prev) => ({ ...prev, [activeRoom]: users?.length || 0 }));
+    // Polite: Only lower socket ID creates offer
+    const handlePeerJoined = async (sid) => {
+      if (sid === voiceSocket.id || peers.current[sid]) return;
+
+      const pc = getOrCreatePeer(sid);
+      if (!pc) return;
+
+      if (voiceSocket.id < sid) {
+        try {
+          const offer = await pc.createOffer();
+          await pc.setLocalDescription(offer);
+          voiceSocket.emit("offer", { to: sid, offer });
+        } catch (err) {
+          console.error("Offer creation failed:", err);
+        }
       }
     };
 
-    const handleUserLeft = ({ sid }) => {
-      setRoomUsers((prev) => prev.filter((u) => u.sid !== sid));
+    const handlePeerLeft = (sid) => {
       if (peers.current[sid]) {
         peers.current[sid].close();
         delete peers.current[sid];
@@ -247,28 +301,53 @@ export default function UserVoiceRooms() {
       }
     };
 
-    voiceSocket.on("room_users", handleRoomUsers);
-    voiceSocket.on("user_left", handleUserLeft);
-    voiceSocket.on("speaking", ({ sid, isSpeaking }) => {
-      setSpeakingUsers((prev) => ({ ...prev, [sid]: isSpeaking }));
-    });
+    // Full list: on join, or after a resync
+    const handleRoomUsers = ({ room, base_room, users, version }) => {
+      if (room !== currentRoom.current && base_room !== currentBaseRoom.current) return;
+      currentRoom.current = room; // server may have placed us in an overflow shard
+      const list = users || [];
+      roomVersion.current = version;
+      setRoomUsers(list);
+      voiceSocket.emit("list_rooms"); // refresh occupancy after our join
+
+      const sids = new Set(list.map((u) => u.sid));
+      Object.keys(peers.current).forEach((sid) => {
+        if (!sids.has(sid)) handlePeerLeft(sid);
+      });
+      list.forEach((u) => handlePeerJoined(u.sid));
+    };
 
-    // Polite: Only lower socket ID creates offer
-    voiceSocket.on("user_joined", async ({ sid }) => {
-      if (sid === voiceSocket.id) return;
+    // Deltas: skip stale ones, resync if a version was missed
+    const applyVersion = (room, version) => {
+      if (version <= roomVersion.current) return false;
+      if (version !== roomVersion.current + 1) {
+        voiceSocket.emit("resync_room", { room });
+      }
+      roomVersion.current = version;
+      return true;
+    };
 
-      const pc = getOrCreatePeer(sid);
-      if (!pc) return;
+    const handleMemberAdded = ({ room, member, version }) => {
+      if (room !== currentRoom.current || !applyVersion(room, version)) return;
+      setRoomUsers((prev) => {
+        return [...prev.filter((u) => u.sid !== member.sid), member];
+      });
+      handlePeerJoined(member.sid);
+    };
 
-      if (voiceSocket.id < sid) {
-        try {
-          const offer = await pc.createOffer();
-          await pc.setLocalDescription(offer);
-          voiceSocket.emit("offer", { to: sid, offer });
-        } catch (err) {
-          console.error("Offer creation failed:", err);
-        }
-      }
+    const handleMemberRemoved = ({ room, sid, version }) => {
+      if (room !== currentRoom.current || !applyVersion(room, version)) return;
+      setRoomUsers((prev) => {
+        return prev.filter((u) => u.sid !== sid);
+      });
+      handlePeerLeft(sid);
+    };
+
+    voiceSocket.on("room_users", handleRoomUsers);
+    voiceSocket.on("member_added", handleMemberAdded);
+    voiceSocket.on("member_removed", handleMemberRemoved);
+    voiceSocket.on("speaking", ({ sid, isSpeaking }) => {
+      setSpeakingUsers((prev) => ({ ...prev, [sid]: isSpeaking }));
     });
 
     voiceSocket.on("offer", async ({ from, offer }) => {
@@ -312,9 +391,9 @@ export default function UserVoiceRooms() {
 
     return () => {
       voiceSocket.off("room_users", handleRoomUsers);
-      voiceSocket.off("user_left", handleUserLeft);
+      voiceSocket.off("member_added", handleMemberAdded);
+      voiceSocket.off("member_removed", handleMemberRemoved);
       voiceSocket.off("speaking");
-      voiceSocket.off("user_joined");
       voiceSocket.off("offer");
       voiceSocket.off("answer");
       voiceSocket.off("ice_candidate");
@@ -375,12 +454,12 @@ export default function UserVoiceRooms() {
                       isActive ? "ring-4 ring-purple-500" : ""
                     }`}
                   >
-                    <div className={`h-full bg-gradient-to-br ${roomGradients[r]} p-8 text-white flex flex-col justify-between`}>
+                    <div className={`h-full bg-gradient-to-br ${roomGradients[r] || "from-slate-400 to-gray-500"} p-8 text-white flex flex-col justify-between`}>
                       <div>
                         <Headphones className="mx-auto mb-6" size={60} />
                         <h3 className="text-2xl font-bold capitalize mb-4">{r}</h3>
                         <p className="text-base opacity-90 leading-relaxed">
-                          {roomDescriptions[r]}
+                          {descriptions[r]}
                         </p>
                       </div>
 
@@ -435,7 +514,7 @@ export default function UserVoiceRooms() {
                       <h3 className="text-3xl font-bold">
                         {activeRoom.charAt(0).toUpperCase() + activeRoom.slice(1)} Room
                       </h3>
-                      <p className="text-gray-600 mt-1">{roomDescriptions[activeRoom]}</p>
+                      <p className="text-gray-600 mt-1">{descriptions[activeRoom]}</p>
                     </div>
                   </div>
                   <span className="text-xl font-semibold text-gray-700">
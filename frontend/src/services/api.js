@@ -65,7 +65,7 @@ export const authAPI = {
 // =========================================================
 export const requestsAPI = {
   create: (data) => api.post("/requests", data),
-  getMy: () => api.get("/requests/my"),
+  getMy: (params) => api.get("/requests/my", { params }),
   getAvailable: () => api.get("/requests/available"),
 
   accept: (id) => api.patch(`/requests/${id}/accept`),
@@ -80,7 +80,7 @@ export const requestsAPI = {
 // =========================================================
 export const ratingsAPI = {
   create: (data) => api.post("/ratings", data),
-  getMy: () => api.get("/ratings/my"),
+  getMy: (params) => api.get("/ratings/my", { params }),
 };
 
 // =========================================================
@@ -93,7 +93,7 @@ export const adminAPI = {
   verifyHelper: (id) => api.patch(`/admin/helpers/${id}/verify`),
 
   // 🔥 SOS features
-  getSOS: () => api.get("/admin/sos"),
+  getSOS: (params) => api.get("/admin/sos", { params }),
   resolveSOS: (id) => api.patch(`/admin/sos/${id}/resolve`),
 };
 